@@ -1,12 +1,24 @@
+from .utils.startup import PROCESS_STARTED, StartupTimer, ensure_schema
+
 import os
+import threading
+import time
 from flask import Flask
 from flask_cors import CORS
 from .config import Config
 from .routes import main_bp, auth_bp, api_bp
 from .models.database import db
+from .services import roast_jobs, recent_views, warm_up_roaster
+from .services.breaker import configure_breakers
+from .utils.migrations import backfill_payloads_command
+
+IMPORTS_MS = round((time.perf_counter() - PROCESS_STARTED) * 1000, 1)
 
 
 def create_app(test_config=None):
+    timer = StartupTimer()
+    timer.phases["imports"] = IMPORTS_MS
+
     app = Flask(__name__, instance_relative_config=True)
 
     app.config.from_object(Config)
@@ -24,10 +36,14 @@ def create_app(test_config=None):
     if test_config:
         app.config.update(test_config)
 
+    configure_breakers(app.config)
+    timer.mark("config")
+
     db.init_app(app)
 
     with app.app_context():
-        db.create_all()
+        ensure_schema(db)
+    timer.mark("schema")
 
     cors_origins = app.config.get("FRONTEND_ORIGIN") or "*"
     CORS(
@@ -39,5 +55,21 @@ def create_app(test_config=None):
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(api_bp)
+    app.cli.add_command(backfill_payloads_command)
+    timer.mark("blueprints")
+
+    roast_jobs.init_app(app)
+    recent_views.init_app(app)
+
+    if app.config.get("GEMINI_WARMUP"):
+        threading.Thread(target=warm_up_roaster, daemon=True).start()
+    timer.mark("workers")
+
+    app.extensions["startup_timer"] = timer
+
+    @app.after_request
+    def record_first_response(response):
+        timer.mark_first_response()
+        return response
 
     return app
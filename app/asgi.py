@@ -0,0 +1,82 @@
+from io import BytesIO
+
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+from .routes.api_routes import generate_roast_async
+from .services.async_http import close_async_client
+
+
+class AsyncRoastApp:
+    "ASGI Front For The Flask App: POST /api/roast Runs On The Event Loop, The Rest Via WSGI"
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.routes = {("POST", "/api/roast"): generate_roast_async}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+
+        view = None
+        if scope["type"] == "http":
+            view = self.routes.get((scope["method"], scope["path"]))
+
+        if view is None:
+            return await self.wsgi(scope, receive, send)
+        await self.dispatch(view, scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await close_async_client()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def dispatch(self, view, scope, receive, send):
+        body = BytesIO()
+        while True:
+            message = await receive()
+            body.write(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body.seek(0)
+
+        # Same environ The WSGI Path Would See, So request, session And CORS Behave Alike
+        builder = WsgiToAsgiInstance(None)
+        builder.scope = scope
+        environ = builder.build_environ(scope, body)
+
+        app = self.flask_app
+        ctx = app.request_context(environ)
+        error = None
+
+        ctx.push()
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await view()
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            response = app.finalize_request(rv)
+        except Exception as e:
+            error = e
+            response = app.handle_exception(e)
+        finally:
+            ctx.pop(error)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [
+                    (name.lower().encode("latin1"), value.encode("latin1"))
+                    for name, value in response.headers.items()
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": response.get_data()})
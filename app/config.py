@@ -34,14 +34,86 @@ class Config:
         "user-read-private user-read-email playlist-read-private playlist-modify-public playlist-modify-private",
     )
 
+    # Upstream Base URLs (Point These At Staging Or The Benchmark Stubs)
+    VALORANT_API_URL = os.getenv(
+        "VALORANT_API_URL", "https://api.henrikdev.xyz/valorant"
+    )
+    ANILIST_API_URL = os.getenv("ANILIST_API_URL", "https://graphql.anilist.co")
+    STEAM_API_URL = os.getenv("STEAM_API_URL", "https://api.steampowered.com")
+    SPOTIFY_API_URL = os.getenv("SPOTIFY_API_URL", "https://api.spotify.com/v1/")
+    GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+
     # Valorant API
     HENRIK_API_KEY = os.getenv("HENRIK_API_KEY")
 
+    # AniList (Entries Fetched Per List)
+    ANILIST_LIST_LIMIT = int(os.getenv("ANILIST_LIST_LIMIT", 10))
+
     # Steam API
     STEAM_API_KEY = os.getenv("STEAM_API_KEY")
 
     # Gemini API
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    GEMINI_MAX_OUTPUT_TOKENS = int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS", 400))
+    GEMINI_TEMPERATURE = os.getenv("GEMINI_TEMPERATURE")
+    GEMINI_WARMUP = os.getenv("GEMINI_WARMUP", "False").lower() in ("true", "1", "t")
+
+    # Provider Fan-Out
+    PROVIDER_TIMEOUT = float(os.getenv("PROVIDER_TIMEOUT", 12))
+    PROVIDER_WORKERS = int(os.getenv("PROVIDER_WORKERS", 8))
+
+    # Deadlines And Circuit Breakers
+    ROAST_DEADLINE = float(os.getenv("ROAST_DEADLINE", 20))
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5))
+    BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", 30))
+    BREAKER_SLOW_CALL = float(os.getenv("BREAKER_SLOW_CALL", 8))
+    BREAKER_TRIAL_TIMEOUT = float(os.getenv("BREAKER_TRIAL_TIMEOUT", 30))
+
+    # Shared HTTP Client
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 8))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 10))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 2))
+    HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", 0.3))
+    ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", 100))
+
+    # Provider Result Cache ("memory" Or "sqlite")
+    PROVIDER_CACHE_BACKEND = os.getenv("PROVIDER_CACHE_BACKEND", "memory")
+    PROVIDER_CACHE_PATH = os.getenv("PROVIDER_CACHE_PATH", "provider_cache.db")
+    PROVIDER_CACHE_SIZE = int(os.getenv("PROVIDER_CACHE_SIZE", 1024))
+
+    # Roast Prompt Size (Estimated Tokens For The Provider Data, 0 Disables Trimming)
+    PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 600))
+
+    # Gemini Roast Reuse (Variants Per Identical Prompt, 0 Disables)
+    ROAST_CACHE_VARIANTS = int(os.getenv("ROAST_CACHE_VARIANTS", 1))
+
+    # Background Roast Jobs
+    ROAST_JOB_WORKERS = int(os.getenv("ROAST_JOB_WORKERS", 2))
+    ROAST_JOB_POLL_INTERVAL = float(os.getenv("ROAST_JOB_POLL_INTERVAL", 1.0))
+    ROAST_JOB_STALE_SECONDS = int(os.getenv("ROAST_JOB_STALE_SECONDS", 300))
+    ROAST_JOB_MAX_ATTEMPTS = int(os.getenv("ROAST_JOB_MAX_ATTEMPTS", 3))
+    ROAST_JOB_RETENTION_SECONDS = int(os.getenv("ROAST_JOB_RETENTION_SECONDS", 86400))
+
+    # Rate Limiting ("sqlite" Shares Buckets Across Workers, "memory" Is Per Process)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() in ("true", "1", "t")
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sqlite")
+    RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH", "rate_limit.db")
+    RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 10000))
+
+    # Metrics ("sqlite" Sums Every Worker For /api/metrics, "memory" Is Per Process)
+    METRICS_BACKEND = os.getenv("METRICS_BACKEND", "sqlite")
+    METRICS_PATH = os.getenv("METRICS_PATH", "metrics.db")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+
+    # Recent View Tracking (Write-Behind, 0 Flushes On Every View)
+    RECENT_VIEW_FLUSH_INTERVAL = float(os.getenv("RECENT_VIEW_FLUSH_INTERVAL", 5))
+    RECENT_VIEW_FLUSH_SIZE = int(os.getenv("RECENT_VIEW_FLUSH_SIZE", 500))
+
+    # HTTP Caching For Roasts And The Public Feed
+    ROAST_MAX_AGE = int(os.getenv("ROAST_MAX_AGE", 86400))
+    ROAST_RESPONSE_CACHE_SIZE = int(os.getenv("ROAST_RESPONSE_CACHE_SIZE", 512))
+    FEED_MAX_AGE = int(os.getenv("FEED_MAX_AGE", 15))
+    FEED_CACHE_TTL = float(os.getenv("FEED_CACHE_TTL", 15))
 
     # Application Settings
     DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "t")
@@ -1,2 +1,10 @@
 from .user_data import CombinedUserData
-from .database import db, User, Roast, RecentRoast
+from .database import (
+    db,
+    User,
+    Roast,
+    RoastPayload,
+    RecentRoast,
+    RoastCompletion,
+    RoastJob,
+)
@@ -1,6 +1,8 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 import hashlib
+import json
+import zlib
 
 db = SQLAlchemy()
 
@@ -38,6 +40,13 @@ class User(db.Model):
             "picture": self.get_avatar(),
         }
 
+    def to_summary(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "picture": self.get_avatar(),
+        }
+
 
 class Roast(db.Model):
     __tablename__ = "roasts"
@@ -46,26 +55,134 @@ class Roast(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     roast_text = db.Column(db.Text, nullable=False)
     sources = db.Column(db.JSON)
-    raw_data = db.Column(db.JSON)
+    # Legacy Inline Payload; New Roasts Store It In roast_payloads
+    raw_data = db.deferred(db.Column(db.JSON))
     inputs = db.Column(db.JSON)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_public = db.Column(db.Boolean, default=True)
 
     # Relationships
     user = db.relationship("User", back_populates="roasts")
+    payload = db.relationship(
+        "RoastPayload", uselist=False, cascade="all, delete-orphan"
+    )
+
+    __table_args__ = (
+        db.Index("ix_roasts_public_feed", "is_public", "created_at", "id"),
+    )
 
     def to_dict(self):
         return {
             "id": self.id,
             "roast": self.roast_text,
             "sources": self.sources,
-            "raw": self.raw_data,
+            "raw": self.get_raw(),
             "inputs": self.inputs,
             "timestamp": self.created_at.isoformat() + "Z",
             "user": self.user.to_dict() if self.user else None,
             "is_public": self.is_public,
         }
 
+    def get_raw(self):
+        if self.payload:
+            return {
+                **self.payload.unpack(),
+                "inputs": self.inputs,
+                "sources": self.sources,
+            }
+        return self.raw_data
+
+    @classmethod
+    def listing(cls):
+        "Query For List Views: Skips raw_data/inputs And Joins The Author"
+        return cls.query.options(
+            db.load_only(
+                cls.id,
+                cls.user_id,
+                cls.roast_text,
+                cls.sources,
+                cls.created_at,
+                cls.is_public,
+            ),
+            db.joinedload(cls.user),
+        )
+
+    def to_list_dict(self):
+        return {
+            "id": self.id,
+            "roast": self.roast_text,
+            "sources": self.sources,
+            "timestamp": self.created_at.isoformat() + "Z",
+            "user": self.user.to_summary() if self.user else None,
+        }
+
+
+class RoastPayload(db.Model):
+    __tablename__ = "roast_payloads"
+
+    roast_id = db.Column(db.String(8), db.ForeignKey("roasts.id"), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    @classmethod
+    def pack(cls, combined_payload):
+        # inputs And sources Already Live On The Roast Row
+        slim = {
+            k: v
+            for k, v in combined_payload.items()
+            if k not in ("inputs", "sources") and v
+        }
+        raw = json.dumps(slim, separators=(",", ":")).encode()
+        return cls(data=zlib.compress(raw, 6))
+
+    def unpack(self):
+        data = json.loads(zlib.decompress(self.data))
+        return {
+            "spotify": {},
+            "valorant": {},
+            "anime": {},
+            "steam": {},
+            **data,
+        }
+
+
+class RoastCompletion(db.Model):
+    __tablename__ = "roast_completions"
+
+    id = db.Column(db.Integer, primary_key=True)
+    prompt_hash = db.Column(db.String(64), nullable=False, index=True)
+    model = db.Column(db.String(64), nullable=False)
+    roast_text = db.Column(db.Text, nullable=False)
+    served_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_served_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RoastJob(db.Model):
+    __tablename__ = "roast_jobs"
+
+    id = db.Column(db.String(12), primary_key=True)
+    roast_id = db.Column(db.String(8), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    status = db.Column(db.String(16), default="queued", nullable=False, index=True)
+    payload = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "roast_id": self.roast_id,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() + "Z",
+            "finished_at": (
+                self.finished_at.isoformat() + "Z" if self.finished_at else None
+            ),
+        }
+
 
 class RecentRoast(db.Model):
     __tablename__ = "recent_roasts"
@@ -1,3 +1,201 @@
+NO_TELEMETRY = "No telemetry received. Invent a roast anyway."
+
+# Rough Gemini Ratio For English Text; Good Enough To Bound Prompt Size
+CHARS_PER_TOKEN = 4
+
+# Longer Single Values (Track Names, Notes) Are Cut So No One Item Eats The Budget
+MAX_VALUE_CHARS = 80
+
+# Reserved Per List For The "(+N more)" Tail
+MORE_SUFFIX_CHARS = 16
+
+
+def hours(value):
+    return None if value is None else f"{value}h"
+
+
+def percent(value):
+    return None if value is None else f"{value}%"
+
+
+# (attribute, header, scalar lines, ranked lists); Scalars Always Go In First,
+# Then List Items Fill What Is Left, Heavier Weights Getting More Items Per Round
+SOURCES = (
+    (
+        "spotify",
+        "Spotify Data",
+        (("Notes", lambda d: d.get("notes")),),
+        (
+            ("top_artists", "Top Artists", 3),
+            ("recent_tracks", "Recent Tracks", 1),
+        ),
+    ),
+    (
+        "valorant",
+        "Valorant Data",
+        (
+            ("IGN", lambda d: d.get("ign")),
+            (
+                "Rank",
+                lambda d: d.get("rank")
+                and (d["rank"] if d.get("elo") is None else f"{d['rank']} (ELO {d['elo']})"),
+            ),
+            ("K/D Ratio", lambda d: d.get("k_d_ratio")),
+            ("Headshot Rate", lambda d: percent(d.get("headshot_rate"))),
+            ("Main Agent", lambda d: d.get("main_agent")),
+            ("Recent Matches", lambda d: d.get("recent_matches")),
+            ("Notes", lambda d: d.get("notes")),
+        ),
+        (),
+    ),
+    (
+        "anime",
+        "AniList Data",
+        (
+            ("Username", lambda d: d.get("username")),
+            ("Days Wasted Watching", lambda d: d.get("days_wasted")),
+            ("Total Episodes Watched", lambda d: d.get("total_episodes")),
+            ("Anime Watching Count", lambda d: d.get("anime_watching")),
+            ("Anime Completed Count", lambda d: d.get("anime_completed")),
+            ("Chapters Read", lambda d: d.get("chapters_read")),
+            ("Volumes Read", lambda d: d.get("volumes_read")),
+            ("Manga Reading Count", lambda d: d.get("manga_reading")),
+            ("Manga Completed Count", lambda d: d.get("manga_completed")),
+            ("Notes", lambda d: d.get("notes")),
+        ),
+        (
+            ("favorite_anime", "Favorite Anime", 3),
+            ("top_anime_genres", "Top Anime Genres", 2),
+            ("anime_watching_list", "Currently Watching", 2),
+            ("anime_completed_list", "Completed Anime", 1),
+            ("favorite_manga", "Favorite Manga", 2),
+            ("top_manga_genres", "Top Manga Genres", 1),
+            ("manga_reading_list", "Currently Reading Manga", 1),
+            ("manga_completed_list", "Completed Manga", 1),
+        ),
+    ),
+    (
+        "steam",
+        "Steam Data",
+        (
+            (
+                "Player",
+                lambda d: d.get("player_name")
+                and (
+                    f"{d['player_name']} (SteamID: {d['steam_id']})"
+                    if d.get("steam_id")
+                    else d["player_name"]
+                ),
+            ),
+            ("Total Playtime", lambda d: hours(d.get("total_playtime_hours"))),
+            ("Notes", lambda d: d.get("notes")),
+        ),
+        (
+            ("top_games", "Top Games", 3),
+            ("recent_games", "Recent Games", 2),
+        ),
+    ),
+)
+
+
+def clip(value):
+    value = str(value)
+    if len(value) <= MAX_VALUE_CHARS:
+        return value
+    return value[: MAX_VALUE_CHARS - 3].rstrip() + "..."
+
+
+def leading_items(items, limit):
+    "Clipped Items From The Front Of A List, Stopping Once Even They Alone Overflow `limit`"
+    kept = []
+    used = 0
+    for item in items:
+        if limit is not None and used > limit:
+            break
+        if item:
+            kept.append(clip(item))
+            used += len(kept[-1]) + 2
+    return kept
+
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def prompt_stats(text, budget, dropped):
+    return {
+        "chars": len(text),
+        "tokens": estimate_tokens(text),
+        "budget": budget or None,
+        "dropped": dropped,
+    }
+
+
+def fit_sections(sections, limit):
+    "Renders Sections, Keeping Whole Lines And The Best-Ranked List Items Under `limit` Chars"
+    used = 0
+
+    def take(cost):
+        nonlocal used
+        if limit is not None and used + cost > limit:
+            return False
+        used += cost
+        return True
+
+    for section in sections:
+        section["kept"] = []
+        if not take(len(section["header"]) + 4):
+            continue
+        for line in section["lines"]:
+            if not take(len(line) + 1):
+                break
+            section["kept"].append(line)
+
+    # Item i Of A Field Ranks At i / weight, So Weight 3 Lists Fill Three Times As Fast
+    fields = [f for section in sections for f in section["fields"]]
+    ranked = sorted(
+        (
+            (i / f["weight"], n, f)
+            for n, f in enumerate(fields)
+            for i in range(len(f["items"]))
+        ),
+        key=lambda entry: entry[:2],
+    )
+
+    for field in fields:
+        field["count"] = 0
+    for _, _, field in ranked:
+        if field.get("full"):
+            continue
+        item = field["items"][field["count"]]
+        if field["count"]:
+            cost = len(item) + 2
+        else:
+            cost = len(field["label"]) + len(item) + 3 + MORE_SUFFIX_CHARS
+        if take(cost):
+            field["count"] += 1
+        else:
+            # Lists Stay Prefixes Of Their Ranking; A Skipped Item Ends Its List
+            field["full"] = True
+
+    parts = []
+    dropped = {}
+    for section in sections:
+        lines = list(section["kept"])
+        for field in section["fields"]:
+            kept = field["items"][: field["count"]]
+            missing = field["total"] - len(kept)
+            if missing:
+                dropped[field["name"]] = missing
+            if kept:
+                more = f" (+{missing} more)" if missing else ""
+                lines.append(f"{field['label']}: {'; '.join(kept)}{more}")
+        if lines:
+            parts.append(f"{section['header']}:\n" + "\n".join(lines))
+
+    return "\n\n".join(parts), dropped
+
+
 class CombinedUserData:
     def __init__(
         self,
@@ -12,6 +210,7 @@ class CombinedUserData:
         self.anime = anime or {}
         self.steam = steam or {}
         self.inputs = inputs or {}
+        self.prompt_stats = None
 
     def as_dict(self):
         return {
@@ -28,51 +227,56 @@ class CombinedUserData:
             ],
         }
 
-    def prompt_block(self):
-        parts = []
-        if self.spotify:
-            parts.append(
-                f"Spotify Data:\nTop Artists: {self.spotify.get('top_artists')}\nRecent Tracks: {self.spotify.get('recent_tracks')}"
-            )
-        if self.valorant:
-            parts.append(
-                "Valorant Data:\n"
-                f"IGN: {self.valorant.get('ign')}\nRank: {self.valorant.get('rank')} (ELO {self.valorant.get('elo')})\n"
-                f"K/D Ratio: {self.valorant.get('k_d_ratio')}\nHeadshot Rate: {self.valorant.get('headshot_rate')}%\n"
-                f"Main Agent: {self.valorant.get('main_agent')}\nRecent Matches: {self.valorant.get('recent_matches')}"
-            )
-        if self.anime:
-            parts.append(
-                "AniList Data:\n"
-                f"Username: {self.anime.get('username')}\nDays Wasted Watching: {self.anime.get('days_wasted')}\n"
-                f"Total Episodes Watched: {self.anime.get('total_episodes')}\n"
-                f"Anime Watching Count: {self.anime.get('anime_watching')}\nAnime Completed Count: {self.anime.get('anime_completed')}\n"
-                f"Currently Watching: {self.anime.get('anime_watching_list')}\n"
-                f"Completed Anime (Top 10): {self.anime.get('anime_completed_list')}\n"
-                f"Top Anime Genres: {self.anime.get('top_anime_genres')}\nFavorite Anime: {self.anime.get('favorite_anime')}\n"
-                f"Chapters Read: {self.anime.get('chapters_read')}\nVolumes Read: {self.anime.get('volumes_read')}\n"
-                f"Manga Reading Count: {self.anime.get('manga_reading')}\nManga Completed Count: {self.anime.get('manga_completed')}\n"
-                f"Currently Reading Manga: {self.anime.get('manga_reading_list')}\n"
-                f"Completed Manga (Top 10): {self.anime.get('manga_completed_list')}\n"
-                f"Top Manga Genres: {self.anime.get('top_manga_genres')}\nFavorite Manga: {self.anime.get('favorite_manga')}"
-            )
-        if self.steam:
-            parts.append(
-                "Steam Data:\n"
-                f"Player: {self.steam.get('player_name')} (SteamID: {self.steam.get('steam_id')})\n"
-                f"Profile: {self.steam.get('profile_url')}\n"
-                f"Total Playtime: {self.steam.get('total_playtime_hours')}h\n"
-                f"Top Games: {self.steam.get('top_games')}\n"
-                f"Recent Games: {self.steam.get('recent_games')}"
-            )
+    def prompt_block(self, budget=None):
+        "Compact Prompt Text Within `budget` Estimated Tokens (None Or 0: No Limit)"
+        limit = budget * CHARS_PER_TOKEN if budget else None
+        sections = []
+        for attr, header, scalars, lists in SOURCES:
+            data = getattr(self, attr)
+            if not data:
+                continue
+
+            lines = []
+            for label, render in scalars:
+                value = render(data)
+                if value not in (None, ""):
+                    lines.append(f"{label}: {clip(value)}")
+
+            fields = []
+            for key, label, weight in lists:
+                raw = data.get(key) or []
+                items = leading_items(raw, limit)
+                if items:
+                    fields.append(
+                        {
+                            "name": f"{attr}.{key}",
+                            "label": label,
+                            "weight": weight,
+                            "items": items,
+                            "total": len(raw),
+                        }
+                    )
+
+            sections.append({"header": header, "lines": lines, "fields": fields})
+
         input_summary = self._format_input_summary()
         if input_summary:
-            parts.append("User Provided Identifiers:\n" + input_summary)
+            sections.append(
+                {
+                    "header": "User Provided Identifiers",
+                    "lines": input_summary.split("\n"),
+                    "fields": [],
+                }
+            )
+
+        text, dropped = fit_sections(sections, limit) if sections else ("", {})
 
-        if not parts:
-            return "No telemetry received. Invent a roast anyway."
+        # Sources Can Be Present Yet Render Nothing (e.g. Spotify With Empty Lists)
+        if not text:
+            text = NO_TELEMETRY
 
-        return "\n\n".join(parts)
+        self.prompt_stats = prompt_stats(text, budget, dropped)
+        return text
 
     def _format_input_summary(self):
         if not self.inputs:
@@ -1,19 +1,57 @@
 from . import api_bp
 from ..models import CombinedUserData
-from ..models.database import db, Roast, RecentRoast
+from ..models.database import db, Roast, RoastPayload, RecentRoast, RoastJob
 from ..services import (
     ValorantService,
     SpotifyService,
-    GeminiRoaster,
+    get_roaster,
     AnimeService,
     SteamService,
+    ProviderFanOut,
+    AsyncProviderFanOut,
+    breaker_states,
+    deadline_scope,
+    get_cache,
+    memoized_roast,
+    memoized_roast_async,
+    memoized_roast_stream,
+    roast_jobs,
+    recent_views,
 )
-
+from ..utils.decorators import check_rate_limit, rate_limit
+from ..utils.http_cache import ResponseCache, conditional_json, serialize
+from ..utils.metrics import get_metrics
+
+import asyncio
+import base64
+import json
+import time
 import uuid
-from datetime import datetime, timedelta
-from flask import jsonify, request, session
+from datetime import datetime
+from contextlib import contextmanager
+from flask import (
+    Response,
+    current_app,
+    g,
+    has_request_context,
+    jsonify,
+    request,
+    session,
+    stream_with_context,
+    url_for,
+)
+
+# Roasts Never Change Once Saved; Feed Pages Are Dropped On Every Public Insert
+# And Expire On Their Own So Other Workers' Inserts Show Up Too
+roast_responses = ResponseCache(max_size=512)
+feed_responses = ResponseCache(max_size=32, ttl=15)
 
-rate_limit_store = {}
+
+@api_bp.record
+def configure_response_caches(state):
+    config = state.app.config
+    roast_responses.configure(max_size=config.get("ROAST_RESPONSE_CACHE_SIZE"))
+    feed_responses.configure(ttl=config.get("FEED_CACHE_TTL"))
 
 
 @api_bp.get("/ping")
@@ -21,6 +59,25 @@ def ping():
     return jsonify({"ok": True})
 
 
+@api_bp.get("/metrics")
+def metrics():
+    return Response(
+        get_metrics().render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@api_bp.get("/startup")
+def startup_timings():
+    return jsonify(current_app.extensions["startup_timer"].to_dict())
+
+
+@api_bp.get("/status")
+def upstream_status():
+    return jsonify(
+        {"breakers": breaker_states(), "provider_cache": get_cache().stats()}
+    )
+
+
 @api_bp.get("/auth/status")
 def auth_status():
     return jsonify(
@@ -33,121 +90,216 @@ def auth_status():
     )
 
 
-@api_bp.post("/roast")
-def generate_roast():
-    client_ip = request.remote_addr
-    now = datetime.utcnow()
-
-    last_request = rate_limit_store.get(client_ip)
-
-    if last_request:
-        elapsed = now - last_request
-        if elapsed < timedelta(minutes=5):
-            wait_time = 300 - int(elapsed.total_seconds())
-            return jsonify(
-                {"error": f"Rate limit exceeded. Please wait {wait_time} seconds."}
-            ), 429
-
-    rate_limit_store[client_ip] = now
-
+def read_roast_inputs():
     body = request.get_json(force=True) if request.is_json else request.form
-    valorant_name = body.get("valorant_name")
-    valorant_tag = body.get("valorant_tag")
-    valorant_region = body.get("valorant_region") or "na"
-    anilist_user = body.get("anilist_user")
-
-    steam_id = body.get("steam_id")
-    steam_vanity = body.get("steam_vanity")
-
-    user_inputs = {
-        "valorant_name": valorant_name,
-        "valorant_tag": valorant_tag,
-        "valorant_region": valorant_region,
-        "anilist_user": anilist_user,
-        "steam_id": steam_id,
-        "steam_vanity": steam_vanity,
+
+    return {
+        "valorant_name": body.get("valorant_name"),
+        "valorant_tag": body.get("valorant_tag"),
+        "valorant_region": body.get("valorant_region") or "na",
+        "anilist_user": body.get("anilist_user"),
+        "steam_id": body.get("steam_id"),
+        "steam_vanity": body.get("steam_vanity"),
     }
 
-    spotify_display_name = None
+
+def spotify_from_session():
     spotify_service = SpotifyService()
     if spotify_service.is_ready():
-        spotify_data = spotify_service.get_roast_profile_data()
-        spotify_display_name = session.get("user_name")
+        return spotify_service, session.get("user_name")
+
+    if session.get("spotify_token_info"):
+        session.pop("spotify_token_info", None)
+    return None, None
+
+
+def build_provider_fanout(user_inputs, spotify_service=None, asynchronous=False):
+    valorant_name = user_inputs.get("valorant_name")
+    valorant_tag = user_inputs.get("valorant_tag")
+    valorant_region = user_inputs.get("valorant_region")
+    anilist_user = user_inputs.get("anilist_user")
+    steam_id = user_inputs.get("steam_id")
+    steam_vanity = user_inputs.get("steam_vanity")
+
+    timeout = current_app.config.get("PROVIDER_TIMEOUT")
+    if asynchronous:
+        fanout = AsyncProviderFanOut(timeout=timeout)
     else:
-        spotify_data = {}
-        if session.get("spotify_token_info"):
-            session.pop("spotify_token_info", None)
+        fanout = ProviderFanOut(timeout=timeout)
+
+    # Same Providers Either Way; The Async Pipeline Just Awaits Their *_async Twins
+    def fetch(method):
+        if asynchronous:
+            return getattr(method.__self__, f"{method.__name__}_async")
+        return method
+
+    if spotify_service:
+        fanout.add("spotify", fetch(spotify_service.get_roast_profile_data))
 
-    valorant_data = {}
     if valorant_name and valorant_tag:
-        valorant_data = ValorantService().get_roast_data(
-            valorant_name, valorant_tag, region=valorant_region
-        ) or {}
-        if not valorant_data:
-            valorant_data = {
+        fanout.add(
+            "valorant",
+            fetch(ValorantService().get_roast_data),
+            valorant_name,
+            valorant_tag,
+            region=valorant_region,
+            fallback={
                 "type": "valorant",
                 "ign": f"{valorant_name}#{valorant_tag}",
                 "notes": "Valorant API unavailable; rely on handle only.",
-            }
+            },
+        )
 
-    anime_data = {}
     if anilist_user:
-        anime_data = AnimeService().get_roast_data(anilist_user) or {}
-        if not anime_data:
-            anime_data = {
+        fanout.add(
+            "anime",
+            fetch(AnimeService().get_roast_data),
+            anilist_user,
+            fallback={
                 "type": "anime",
                 "username": anilist_user,
                 "notes": "AniList data unavailable at generation time.",
-            }
+            },
+        )
 
-    steam_data = {}
     if steam_id or steam_vanity:
-        steam_data = SteamService().get_roast_data(
-            steam_id=steam_id, vanity=steam_vanity
-        ) or {}
-        if not steam_data:
-            steam_data = {
+        fanout.add(
+            "steam",
+            fetch(SteamService().get_roast_data),
+            steam_id=steam_id,
+            vanity=steam_vanity,
+            fallback={
                 "type": "steam",
                 "steam_id": steam_id or steam_vanity,
                 "notes": "Steam stats unavailable; id provided only.",
-            }
+            },
+        )
+
+    return fanout
 
-    combined = CombinedUserData(
-        spotify=spotify_data,
-        valorant=valorant_data,
-        anime=anime_data,
-        steam=steam_data,
-        inputs={**user_inputs, "spotify_name": spotify_display_name},
+
+def combine_provider_data(provider_data, inputs):
+    return CombinedUserData(
+        spotify=provider_data.get("spotify"),
+        valorant=provider_data.get("valorant"),
+        anime=provider_data.get("anime"),
+        steam=provider_data.get("steam"),
+        inputs=inputs,
     )
-    combined_payload = combined.as_dict()
-    prompt_block = combined.prompt_block()
 
-    roast_text = ""
+
+@contextmanager
+def roast_stage(stage):
+    started = time.monotonic()
+    try:
+        with get_metrics().timer(
+            "roast_stage_seconds", errors="roast_stage_errors_total", stage=stage
+        ):
+            yield
+    finally:
+        record_timing(stage, time.monotonic() - started)
+
+
+def record_timing(name, seconds):
+    if has_request_context():
+        g.setdefault("stage_timings", {})[name] = seconds
+
+
+def run_fanout(fanout):
+    with roast_stage("fanout"):
+        provider_data = fanout.run()
+
+    for name, seconds in fanout.timings.items():
+        record_timing(f"provider_{name}", seconds)
+    return provider_data
+
+
+@api_bp.after_request
+def add_server_timing(response):
+    # Lets Load Tests And Browser Devtools See Where A Roast Spent Its Time
+    timings = g.get("stage_timings")
+    if timings:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()
+        )
+    return response
+
+
+def build_prompt_block(combined):
+    with roast_stage("prompt"):
+        prompt_block = combined.prompt_block(current_app.config.get("PROMPT_TOKEN_BUDGET"))
+
+    stats = combined.prompt_stats
+    get_metrics().observe("roast_prompt_tokens", stats["tokens"])
+    dropped = sum(stats["dropped"].values())
+    if dropped:
+        get_metrics().inc("roast_prompt_truncations_total", dropped)
+    return prompt_block
+
+
+def generate_roast_text(combined):
     try:
-        gemini = GeminiRoaster()
-        roast_text = gemini.roast(prompt_block)
+        prompt_block = build_prompt_block(combined)
+
+        with roast_stage("generate"):
+            return memoized_roast(
+                get_roaster(),
+                prompt_block,
+                current_app.config.get("ROAST_CACHE_VARIANTS"),
+            )
     except Exception as e:
-        roast_text = f"Failed To Generate Roast: {e}"
+        return f"Failed To Generate Roast: {e}"
 
-    roast_id = str(uuid.uuid4())[:8]
 
-    user_id = session.get("user_id")
+async def generate_roast_text_async(combined):
+    try:
+        prompt_block = build_prompt_block(combined)
+
+        with roast_stage("generate"):
+            return await memoized_roast_async(
+                get_roaster(),
+                prompt_block,
+                current_app.config.get("ROAST_CACHE_VARIANTS"),
+            )
+    except Exception as e:
+        return f"Failed To Generate Roast: {e}"
+
+
+async def run_fanout_async(fanout):
+    with roast_stage("fanout"):
+        provider_data = await fanout.run()
+
+    for name, seconds in fanout.timings.items():
+        record_timing(f"provider_{name}", seconds)
+    return provider_data
+
+
+def save_roast(roast_id, user_id, roast_text, combined):
+    combined_payload = combined.as_dict()
+
     roast = Roast(
         id=roast_id,
         user_id=user_id,
         roast_text=roast_text,
         sources=combined_payload["sources"],
-        raw_data=combined_payload,
-        inputs={**user_inputs, "spotify_name": spotify_display_name},
+        inputs=combined.inputs,
         is_public=True,
+        payload=RoastPayload.pack(combined_payload),
     )
     db.session.add(roast)
+    with roast_stage("save"):
+        db.session.commit()
+
+    if roast.is_public:
+        feed_responses.clear()
 
     if user_id:
         track_recent_roast(user_id, roast_id)
 
-    db.session.commit()
+    return roast
 
+
+def remember_roast_id(roast_id):
     try:
         my_roast_ids = session.get("my_roast_ids", [])
 
@@ -159,52 +311,206 @@ def generate_roast():
     except Exception:
         pass
 
-    session.pop("spotify_token_info", None)
+
+def roast_response(roast, combined_payload):
+    return {
+        "id": roast.id,
+        "sources": combined_payload["sources"],
+        "roast": roast.roast_text,
+        "raw": combined_payload,
+        "inputs": roast.inputs,
+        "timestamp": roast.created_at.isoformat() + "Z",
+    }
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@api_bp.post("/roast")
+@rate_limit("roast", limit=1, period=300)
+def generate_roast():
+    spotify_service, spotify_name = spotify_from_session()
+    inputs = {**read_roast_inputs(), "spotify_name": spotify_name}
+
+    with deadline_scope(current_app.config.get("ROAST_DEADLINE")):
+        fanout = build_provider_fanout(inputs, spotify_service)
+        combined = combine_provider_data(run_fanout(fanout), inputs)
+        roast_text = generate_roast_text(combined)
+
+    roast_id = str(uuid.uuid4())[:8]
+    roast = save_roast(roast_id, session.get("user_id"), roast_text, combined)
+
+    remember_roast_id(roast_id)
+
+    return jsonify(roast_response(roast, combined.as_dict()))
+
+
+async def generate_roast_async():
+    "POST /api/roast As Served By app.asgi: Fan-Out And Gemini Never Hold A Thread"
+    # Rate Limiter Transactions And Spotify Token Refreshes Block; Run Them On Threads
+    limited = await asyncio.to_thread(check_rate_limit, "roast", limit=1, period=300)
+    if limited:
+        return limited
+
+    spotify_service, spotify_name = await asyncio.to_thread(spotify_from_session)
+    inputs = {**read_roast_inputs(), "spotify_name": spotify_name}
+
+    with deadline_scope(current_app.config.get("ROAST_DEADLINE")):
+        fanout = build_provider_fanout(inputs, spotify_service, asynchronous=True)
+        combined = combine_provider_data(await run_fanout_async(fanout), inputs)
+        roast_text = await generate_roast_text_async(combined)
+
+    # The Database Stays Synchronous; Keep Its Round Trips Off The Event Loop
+    roast_id = str(uuid.uuid4())[:8]
+    roast = await asyncio.to_thread(
+        save_roast, roast_id, session.get("user_id"), roast_text, combined
+    )
+    body = await asyncio.to_thread(roast_response, roast, combined.as_dict())
+
+    remember_roast_id(roast_id)
+
+    return jsonify(body)
+
+
+@api_bp.post("/roast/stream")
+@rate_limit("roast", limit=1, period=300)
+def stream_roast():
+    spotify_service, spotify_name = spotify_from_session()
+    inputs = {**read_roast_inputs(), "spotify_name": spotify_name}
+    fanout = build_provider_fanout(inputs, spotify_service)
+    roast_id = str(uuid.uuid4())[:8]
+    user_id = session.get("user_id")
+    variants = current_app.config.get("ROAST_CACHE_VARIANTS")
+
+    # Headers Go Out With The First Event, So Session Writes Happen Up Front
+    remember_roast_id(roast_id)
+
+    # The Clock Starts Now, Not When The Server First Pulls From The Generator
+    until = time.monotonic() + current_app.config.get("ROAST_DEADLINE", 20)
+
+    @stream_with_context
+    def events():
+        with deadline_scope(until=until):
+            provider_data = {}
+            with roast_stage("fanout"):
+                for name, data in fanout.results():
+                    provider_data[name] = data
+                    yield sse_event("provider", {"provider": name, "data": data})
+
+            combined = combine_provider_data(provider_data, inputs)
+            yield sse_event("sources", {"sources": combined.as_dict()["sources"]})
+
+            chunks = []
+            try:
+                prompt_block = build_prompt_block(combined)
+
+                with roast_stage("generate"):
+                    for chunk in memoized_roast_stream(
+                        get_roaster(), prompt_block, variants
+                    ):
+                        chunks.append(chunk)
+                        yield sse_event("token", {"text": chunk})
+                roast_text = "".join(chunks).strip()
+            except Exception as e:
+                roast_text = f"Failed To Generate Roast: {e}"
+                yield sse_event("error", {"error": roast_text})
+
+        roast = save_roast(roast_id, user_id, roast_text, combined)
+        yield sse_event("done", roast_response(roast, combined.as_dict()))
+
+    return Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@api_bp.post("/roast/job")
+@rate_limit("roast", limit=1, period=300)
+def enqueue_roast():
+    spotify_service, spotify_name = spotify_from_session()
+    inputs = {**read_roast_inputs(), "spotify_name": spotify_name}
+    roast_id = str(uuid.uuid4())[:8]
+
+    payload = {"inputs": inputs}
+    if spotify_service:
+        # Only The Short-Lived Access Token Is Queued, Never The Refresh Token
+        payload["spotify"] = {"access_token": spotify_service.access_token}
+
+    job = RoastJob(
+        id=uuid.uuid4().hex[:12],
+        roast_id=roast_id,
+        user_id=session.get("user_id"),
+        payload=payload,
+    )
+    db.session.add(job)
+    db.session.commit()
+    roast_jobs.notify()
+
+    remember_roast_id(roast_id)
 
     return jsonify(
         {
-            "id": roast_id,
-            "sources": combined_payload["sources"],
-            "roast": roast_text,
-            "raw": combined_payload,
-            "inputs": roast.inputs,
-            "timestamp": roast.created_at.isoformat() + "Z",
+            **job.to_dict(),
+            "status_url": url_for("api.get_roast_job", job_id=job.id),
         }
-    )
+    ), 202
+
+
+@roast_jobs.task
+def run_roast_job(job):
+    payload = job.payload or {}
+    inputs = payload.get("inputs", {})
+
+    spotify_service = None
+    if payload.get("spotify"):
+        spotify_service = SpotifyService(token_info=payload["spotify"])
+
+    with deadline_scope(current_app.config.get("ROAST_DEADLINE")):
+        fanout = build_provider_fanout(inputs, spotify_service)
+        combined = combine_provider_data(run_fanout(fanout), inputs)
+        roast_text = generate_roast_text(combined)
+
+    save_roast(job.roast_id, job.user_id, roast_text, combined)
+
+
+@api_bp.get("/roast/job/<job_id>")
+def get_roast_job(job_id):
+    job = db.session.get(RoastJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found!"}), 404
+
+    result = job.to_dict()
+    if job.status == "done":
+        roast = db.session.get(Roast, job.roast_id)
+        result["result"] = roast.to_dict() if roast else None
+
+    return jsonify(result)
 
 
 @api_bp.get("/roast/<roast_id>")
 def get_roast(roast_id):
-    roast = Roast.query.filter_by(id=roast_id).first()
-    if not roast:
-        return jsonify({"error": "Roast not found!"}), 404
+    cached = roast_responses.get(roast_id)
+
+    if not cached:
+        roast = Roast.query.filter_by(id=roast_id).first()
+        if not roast:
+            return jsonify({"error": "Roast not found!"}), 404
+
+        cached = roast_responses.set(roast_id, serialize(roast.to_dict()))
 
     user_id = session.get("user_id")
     if user_id:
         track_recent_roast(user_id, roast_id)
-        db.session.commit()
 
-    return jsonify(roast.to_dict())
+    return conditional_json(
+        *cached, max_age=current_app.config.get("ROAST_MAX_AGE", 86400)
+    )
 
 
 def track_recent_roast(user_id, roast_id):
-    recent = RecentRoast.query.filter_by(user_id=user_id, roast_id=roast_id).first()
-
-    if recent:
-        recent.viewed_at = datetime.utcnow()
-
-    else:
-        recent = RecentRoast(user_id=user_id, roast_id=roast_id)
-        db.session.add(recent)
-
-    old_recents = (
-        RecentRoast.query.filter_by(user_id=user_id)
-        .order_by(RecentRoast.viewed_at.desc())
-        .offset(20)
-        .all()
-    )
-    for old in old_recents:
-        db.session.delete(old)
+    recent_views.record(user_id, roast_id)
 
 
 @api_bp.get("/roast/history")
@@ -214,39 +520,75 @@ def get_history():
     if not user_id:
         return jsonify({"roasts": []})
 
-    recent_entries = (
-        RecentRoast.query.filter_by(user_id=user_id)
+    roasts = (
+        Roast.listing()
+        .join(RecentRoast, RecentRoast.roast_id == Roast.id)
+        .filter(RecentRoast.user_id == user_id)
         .order_by(RecentRoast.viewed_at.desc())
         .limit(10)
         .all()
     )
 
-    roasts = [entry.roast.to_dict() for entry in recent_entries if entry.roast]
-    return jsonify({"roasts": roasts})
+    return jsonify({"roasts": [r.to_list_dict() for r in roasts]})
+
+
+def encode_feed_cursor(roast):
+    raw = f"{roast.created_at.isoformat()}|{roast.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_feed_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    created_at, roast_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+    return datetime.fromisoformat(created_at), roast_id
 
 
 @api_bp.get("/roast/public")
 def get_public_roasts():
-    page = request.args.get("page", 1, type=int)
-    per_page = 20
-
+    per_page = max(1, min(request.args.get("limit", 20, type=int), 50))
+    before = request.args.get("before")
+    max_age = current_app.config.get("FEED_MAX_AGE", 15)
+
+    cached = feed_responses.get((before, per_page))
+    if cached:
+        return conditional_json(*cached, max_age=max_age)
+
+    query = Roast.listing().filter(Roast.is_public.is_(True))
+
+    if before:
+        try:
+            created_at, roast_id = decode_feed_cursor(before)
+        except Exception:
+            return jsonify({"error": "Invalid cursor!"}), 400
+
+        query = query.filter(
+            db.or_(
+                Roast.created_at < created_at,
+                db.and_(Roast.created_at == created_at, Roast.id < roast_id),
+            )
+        )
+
+    # One Extra Row Tells Us Whether Another Page Exists Without A COUNT(*)
     roasts = (
-        Roast.query.filter_by(is_public=True)
-        .order_by(Roast.created_at.desc())
-        .paginate(page=page, per_page=per_page, error_out=False)
+        query.order_by(Roast.created_at.desc(), Roast.id.desc())
+        .limit(per_page + 1)
+        .all()
     )
-
-    return jsonify(
-        {
-            "roasts": [r.to_dict() for r in roasts.items],
-            "total": roasts.total,
-            "page": page,
-            "pages": roasts.pages,
-            "has_next": roasts.has_next,
-            "has_prev": roasts.has_prev,
-            "per_page": per_page,
-        }
+    has_next = len(roasts) > per_page
+    roasts = roasts[:per_page]
+
+    cached = feed_responses.set(
+        (before, per_page),
+        serialize(
+            {
+                "roasts": [r.to_list_dict() for r in roasts],
+                "next_cursor": encode_feed_cursor(roasts[-1]) if has_next else None,
+                "has_next": has_next,
+                "per_page": per_page,
+            }
+        ),
     )
+    return conditional_json(*cached, max_age=max_age)
 
 
 @api_bp.get("/roast/mine")
@@ -256,9 +598,9 @@ def get_my_roasts():
     if not ids:
         return jsonify({"roasts": []})
 
-    items = Roast.query.filter(Roast.id.in_(ids)).all()
+    items = Roast.listing().filter(Roast.id.in_(ids)).all()
     by_id = {r.id: r for r in items}
 
-    ordered = [by_id[i].to_dict() for i in ids if i in by_id]
+    ordered = [by_id[i].to_list_dict() for i in ids if i in by_id]
 
     return jsonify({"roasts": ordered})
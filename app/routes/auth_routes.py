@@ -1,12 +1,14 @@
 from . import auth_bp
 
 import os
-from spotipy.oauth2 import SpotifyOAuth
 from flask import redirect, request, session, url_for, current_app
 
+from ..services.http_client import borrowed_session
+from ..utils.startup import lazy_import
+
 
 def get_spotify_oauth():
-    return SpotifyOAuth(
+    return lazy_import("spotipy.oauth2").SpotifyOAuth(
         client_id=os.getenv("SPOTIFY_CLIENT_ID"),
         client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
         redirect_uri=os.getenv(
@@ -18,6 +20,7 @@ def get_spotify_oauth():
         ),
         cache_path=None,
         show_dialog=True,
+        requests_session=borrowed_session(),
     )
 
 
@@ -45,9 +48,9 @@ def spotify_callback():
         session["spotify_authenticated"] = True
 
         try:
-            import spotipy
-
-            sp = spotipy.Spotify(auth=token_info["access_token"])
+            sp = lazy_import("spotipy").Spotify(
+                auth=token_info["access_token"], requests_session=borrowed_session()
+            )
             user_info = sp.current_user()
 
             session["user_name"] = user_info.get("display_name") or user_info.get("id")
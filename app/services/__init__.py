@@ -1,5 +1,12 @@
 from .valorant import ValorantService
 from .spotify import SpotifyService
-from .gemini import GeminiRoaster
+from .gemini import GeminiRoaster, get_roaster, warm_up_roaster
 from .anime import AnimeService
 from .steam import SteamService
+from .aggregator import AsyncProviderFanOut, ProviderFanOut
+from .breaker import breaker_states
+from .cache import get_cache
+from .deadline import deadline_scope
+from .roast_memo import memoized_roast, memoized_roast_async, memoized_roast_stream
+from .jobs import roast_jobs
+from .view_tracker import recent_views
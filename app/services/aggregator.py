@@ -0,0 +1,201 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .breaker import get_breaker
+from .deadline import current_deadline, submit_in_context
+from ..utils.metrics import get_metrics
+
+_executor = None
+_subrequest_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("PROVIDER_WORKERS", 8)),
+                    thread_name_prefix="provider",
+                )
+    return _executor
+
+
+def get_subrequest_executor():
+    "Pool For Calls A Provider Makes In Parallel, Kept Apart So It Cannot Starve"
+    global _subrequest_executor
+
+    if _subrequest_executor is None:
+        with _executor_lock:
+            if _subrequest_executor is None:
+                _subrequest_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("PROVIDER_SUBREQUEST_WORKERS", 8)),
+                    thread_name_prefix="provider-sub",
+                )
+    return _subrequest_executor
+
+
+class ProviderFanOut:
+    "Runs Provider Fetches Concurrently, Each With Its Own Deadline"
+
+    def __init__(self, timeout=None, executor=None):
+        self.timeout = timeout or float(os.getenv("PROVIDER_TIMEOUT", 12))
+        self.executor = executor or get_executor()
+        self.tasks = []
+        self.timings = {}
+        self.started = set()
+
+    def add(self, name, fn, *args, fallback=None, timeout=None, **kwargs):
+        self.tasks.append(
+            {
+                "name": name,
+                "call": lambda: fn(*args, **kwargs),
+                "fallback": fallback,
+                "timeout": timeout or self.timeout,
+            }
+        )
+        return self
+
+    def results(self):
+        started = time.monotonic()
+        request_deadline = current_deadline()
+        pending = {}
+
+        for task in self.tasks:
+            # Open Breakers Answer With The Fallback Instead Of Taking A Worker
+            if get_breaker(task["name"]).is_open():
+                get_metrics().inc(
+                    "provider_errors_total", provider=task["name"], reason="circuit_open"
+                )
+                yield task["name"], self._fallback(task)
+                continue
+
+            deadline = started + task["timeout"]
+            if request_deadline is not None:
+                deadline = min(deadline, request_deadline)
+
+            future = submit_in_context(self.executor, self._timed, task)
+            pending[future] = {**task, "deadline": deadline}
+
+        while pending:
+            now = time.monotonic()
+
+            for future, task in list(pending.items()):
+                if not future.done() and now >= task["deadline"]:
+                    del pending[future]
+                    # Breakers Are Fed By The HTTP Layer; A Task Still Waiting For A
+                    # Worker Says Nothing About Its Upstream, So It Counts As "queued"
+                    reason = "timeout" if task["name"] in self.started else "queued"
+                    get_metrics().inc(
+                        "provider_errors_total", provider=task["name"], reason=reason
+                    )
+                    yield task["name"], self._fallback(task)
+
+            if not pending:
+                break
+
+            next_deadline = min(task["deadline"] for task in pending.values())
+            done, _ = wait(
+                pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED
+            )
+
+            for future in done:
+                task = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"{task['name']} provider error: {e}")
+                    get_metrics().inc(
+                        "provider_errors_total", provider=task["name"], reason="error"
+                    )
+                    result = None
+                else:
+                    if not result:
+                        get_metrics().inc(
+                            "provider_errors_total", provider=task["name"], reason="empty"
+                        )
+
+                yield task["name"], result or self._fallback(task)
+
+    def run(self):
+        return dict(self.results())
+
+    def _timed(self, task):
+        started = time.monotonic()
+        self.started.add(task["name"])
+        try:
+            with get_metrics().timer("provider_fetch_seconds", provider=task["name"]):
+                return task["call"]()
+        finally:
+            self.timings[task["name"]] = time.monotonic() - started
+
+    @staticmethod
+    def _fallback(task):
+        fallback = task["fallback"]
+        return fallback() if callable(fallback) else (fallback or {})
+
+
+class AsyncProviderFanOut(ProviderFanOut):
+    "ProviderFanOut For Coroutine Fetches; Every Provider Shares One Event Loop"
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout or float(os.getenv("PROVIDER_TIMEOUT", 12))
+        self.tasks = []
+        self.timings = {}
+
+    async def run(self):
+        started = time.monotonic()
+        request_deadline = current_deadline()
+        names = []
+        calls = []
+
+        for task in self.tasks:
+            names.append(task["name"])
+
+            if get_breaker(task["name"]).is_open():
+                get_metrics().inc(
+                    "provider_errors_total", provider=task["name"], reason="circuit_open"
+                )
+                calls.append(self._resolved(self._fallback(task)))
+                continue
+
+            deadline = started + task["timeout"]
+            if request_deadline is not None:
+                deadline = min(deadline, request_deadline)
+            calls.append(self._guarded(task, max(0, deadline - time.monotonic())))
+
+        return dict(zip(names, await asyncio.gather(*calls)))
+
+    async def _guarded(self, task, timeout):
+        try:
+            result = await asyncio.wait_for(self._timed_async(task), timeout)
+        except asyncio.TimeoutError:
+            get_metrics().inc(
+                "provider_errors_total", provider=task["name"], reason="timeout"
+            )
+            return self._fallback(task)
+        except Exception as e:
+            print(f"{task['name']} provider error: {e}")
+            get_metrics().inc("provider_errors_total", provider=task["name"], reason="error")
+            return self._fallback(task)
+
+        if not result:
+            get_metrics().inc("provider_errors_total", provider=task["name"], reason="empty")
+        return result or self._fallback(task)
+
+    async def _timed_async(self, task):
+        started = time.monotonic()
+        try:
+            with get_metrics().timer("provider_fetch_seconds", provider=task["name"]):
+                return await task["call"]()
+        finally:
+            self.timings[task["name"]] = time.monotonic() - started
+
+    @staticmethod
+    async def _resolved(value):
+        return value
@@ -1,170 +1,213 @@
-import requests
+import os
+
+from . import async_http
+from .cache import get_cache
+from .http_client import get_session
+
+USER_FIELDS = """
+    name
+    siteUrl
+    statistics {
+      anime {
+        count
+        minutesWatched
+        episodesWatched
+        statuses { status count }
+        genres(limit:5, sort: COUNT_DESC){ genre count }
+      }
+      manga {
+        count
+        chaptersRead
+        volumesRead
+        statuses { status count }
+        genres(limit:5, sort: COUNT_DESC){ genre count }
+      }
+    }
+    favourites {
+      anime(perPage: 10){ nodes { title { romaji english } } }
+      manga(perPage:10){ nodes { title { romaji english } } }
+    }
+"""
+
+# (alias, media type, status, sort) for each list we show
+LISTS = (
+    ("animeWatching", "ANIME", "CURRENT", "UPDATED_TIME_DESC"),
+    ("animeCompleted", "ANIME", "COMPLETED", "SCORE_DESC"),
+    ("mangaReading", "MANGA", "CURRENT", "UPDATED_TIME_DESC"),
+    ("mangaCompleted", "MANGA", "COMPLETED", "SCORE_DESC"),
+)
+
+
+def build_query(count):
+    "One Aliased Query For `count` Users, Each List Capped At $perPage Entries"
+    variables = ", ".join(f"$name{i}: String" for i in range(count))
+    blocks = []
+
+    for i in range(count):
+        blocks.append(f"u{i}: User(name: $name{i}) {{{USER_FIELDS}}}")
+
+        for alias, media_type, status, sort in LISTS:
+            blocks.append(
+                f"u{i}_{alias}: Page(perPage: $perPage) {{ "
+                f"mediaList(userName: $name{i}, type: {media_type}, "
+                f"status: {status}, sort: {sort}) "
+                "{ media { title { romaji english } } } }"
+            )
 
+    return f"query ({variables}, $perPage: Int) {{\n" + "\n".join(blocks) + "\n}"
 
-class AnimeService:
-    def __init__(self):
-        self.url = "https://graphql.anilist.co"
 
-    def get_roast_data(self, username):
-        query = """
-        query ($name: String) {
-          User(name: $name) {
-            name
-            siteUrl
-            statistics { 
-              anime { 
-                count 
-                minutesWatched 
-                episodesWatched 
-                statuses { status count } 
-                genres(limit:5, sort: COUNT_DESC){ genre count } 
-              } 
-              manga { 
-                count 
-                chaptersRead 
-                volumesRead 
-                statuses { status count } 
-                genres(limit:5, sort: COUNT_DESC){ genre count } 
-              } 
-            }
-            favourites { 
-              anime(perPage: 10){ nodes { title { romaji english } } } 
-              manga(perPage:10){ nodes { title { romaji english } } } 
-            }
-          }
-          animeWatching: MediaListCollection(userName: $name, type: ANIME, status: CURRENT) {
-            lists {
-              entries {
-                media {
-                  title { romaji english }
-                }
-              }
-            }
-          }
-          animeCompleted: MediaListCollection(userName: $name, type: ANIME, status: COMPLETED, sort: SCORE_DESC) {
-            lists {
-              entries {
-                media {
-                  title { romaji english }
-                }
-              }
-            }
-          }
-          mangaReading: MediaListCollection(userName: $name, type: MANGA, status: CURRENT) {
-            lists {
-              entries {
-                media {
-                  title { romaji english }
-                }
-              }
-            }
-          }
-          mangaCompleted: MediaListCollection(userName: $name, type: MANGA, status: COMPLETED, sort: SCORE_DESC) {
-            lists {
-              entries {
-                media {
-                  title { romaji english }
-                }
-              }
-            }
-          }
-        }
-        """
-        variables = {"name": username}
+def status_count(block, key):
+    for s in block.get("statuses", []):
+        if s["status"] == key:
+            return s["count"]
+    return 0
 
-        try:
-            response = requests.post(
-                self.url, json={"query": query, "variables": variables}, timeout=10
-            )
 
-            if response.status_code != 200:
-                return {}
+def extract_titles(nodes, limit=10):
+    titles = []
 
-            data = response.json()
+    for node in nodes[:limit]:
+        t = node["title"]["english"] or node["title"]["romaji"]
+        titles.append(t)
 
-            if "errors" in data:
-                return {}
+    return titles
 
-            user = data["data"]["User"]
-            animestats = user["statistics"]["anime"]
-            mangastats = user["statistics"]["manga"]
 
-            minutes = animestats["minutesWatched"]
-            days_wasted = round(minutes / 60 / 24, 1)
+def extract_from_page(page_data, limit=10):
+    titles = []
 
-            def status_count(block, key):
-                for s in block.get("statuses", []):
-                    if s["status"] == key:
-                        return s["count"]
-                return 0
+    for entry in (page_data or {}).get("mediaList") or []:
+        if len(titles) >= limit:
+            break
 
-            anime_watching = status_count(animestats, "CURRENT")
-            anime_completed = status_count(animestats, "COMPLETED")
-            manga_reading = status_count(mangastats, "CURRENT")
-            manga_completed = status_count(mangastats, "COMPLETED")
+        media = entry.get("media") or {}
+        title = media.get("title") or {}
+        t = title.get("english") or title.get("romaji")
 
-            def extract_titles(nodes, limit=10):
-                titles = []
+        if t:
+            titles.append(t)
 
-                for node in nodes[:limit]:
-                    t = node["title"]["english"] or node["title"]["romaji"]
-                    titles.append(t)
+    return titles
 
-                return titles
 
-            def extract_from_lists(list_data, limit=10):
-                titles = []
+def parse_user(data, prefix, limit=10):
+    user = data.get(prefix)
+    if not user:
+        return {}
 
-                for lst in list_data.get("lists", []):
-                    for entry in lst.get("entries", []):
-                        if len(titles) >= limit:
-                            break
+    animestats = user["statistics"]["anime"]
+    mangastats = user["statistics"]["manga"]
 
-                        media = entry.get("media", {})
-                        title = media.get("title", {})
-                        t = title.get("english") or title.get("romaji")
+    minutes = animestats["minutesWatched"]
+    days_wasted = round(minutes / 60 / 24, 1)
 
-                        if t:
-                            titles.append(t)
+    lists = {
+        alias: extract_from_page(data.get(f"{prefix}_{alias}"), limit)
+        for alias, _, _, _ in LISTS
+    }
 
-                    if len(titles) >= limit:
-                        break
-                return titles[:limit]
+    return {
+        "type": "anime",
+        "username": user["name"],
+        "days_wasted": days_wasted,
+        "total_episodes": animestats["episodesWatched"],
+        "anime_watching": status_count(animestats, "CURRENT"),
+        "anime_completed": status_count(animestats, "COMPLETED"),
+        "anime_watching_list": lists["animeWatching"],
+        "anime_completed_list": lists["animeCompleted"],
+        "top_anime_genres": [g["genre"] for g in animestats.get("genres", [])],
+        "favorite_anime": extract_titles(user["favourites"]["anime"]["nodes"]),
+        "chapters_read": mangastats["chaptersRead"],
+        "volumes_read": mangastats["volumesRead"],
+        "manga_reading": status_count(mangastats, "CURRENT"),
+        "manga_completed": status_count(mangastats, "COMPLETED"),
+        "manga_reading_list": lists["mangaReading"],
+        "manga_completed_list": lists["mangaCompleted"],
+        "top_manga_genres": [g["genre"] for g in mangastats.get("genres", [])],
+        "favorite_manga": extract_titles(user["favourites"]["manga"]["nodes"]),
+        "profile_url": user["siteUrl"],
+    }
 
-            anime_watching_list = extract_from_lists(
-                data["data"].get("animeWatching", {}), 10
-            )
-            anime_completed_list = extract_from_lists(
-                data["data"].get("animeCompleted", {}), 10
-            )
-            manga_reading_list = extract_from_lists(
-                data["data"].get("mangaReading", {}), 10
+
+class AnimeService:
+    def __init__(self, list_limit=None):
+        self.url = os.getenv("ANILIST_API_URL", "https://graphql.anilist.co")
+        self.list_limit = list_limit or int(os.getenv("ANILIST_LIST_LIMIT", 10))
+
+    def get_roast_data(self, username):
+        return self.get_roast_data_batch([username]).get(username, {})
+
+    def get_roast_data_batch(self, usernames):
+        "Roast Data For Several Users, Fetching Every Cache Miss In One Request"
+        cache = get_cache()
+        results = {}
+        missing = []
+
+        for username in dict.fromkeys(usernames):
+            cached = None
+            if cache.enabled("anime", username):
+                cached = cache.get("anime", username)
+
+            if cached is not None:
+                results[username] = cached
+            else:
+                missing.append(username)
+
+        if missing:
+            fetched = self._fetch_batch(missing)
+            for username in missing:
+                results[username] = fetched.get(username, {})
+                if cache.enabled("anime", username):
+                    cache.set("anime", username, results[username])
+
+        return results
+
+    async def get_roast_data_async(self, username):
+        async def fetch():
+            return (await self._fetch_batch_async([username])).get(username, {})
+
+        return await get_cache().get_or_fetch_async("anime", username, fetch)
+
+    def _batch_request(self, usernames):
+        variables = {f"name{i}": name for i, name in enumerate(usernames)}
+        variables["perPage"] = self.list_limit
+        return {"query": build_query(len(usernames)), "variables": variables}
+
+    def _parse_batch(self, response, usernames):
+        if response.status_code not in (200, 404):
+            return {}
+
+        # Unknown users come back as null aliases alongside an "errors" list
+        data = response.json().get("data") or {}
+
+        results = {}
+        for i, username in enumerate(usernames):
+            try:
+                results[username] = parse_user(data, f"u{i}", self.list_limit)
+            except Exception as e:
+                print(f"AniList parse error for {username}: {e}")
+                results[username] = {}
+        return results
+
+    def _fetch_batch(self, usernames):
+        try:
+            response = get_session().post(
+                self.url, json=self._batch_request(usernames), timeout=10
             )
-            manga_completed_list = extract_from_lists(
-                data["data"].get("mangaCompleted", {}), 10
+            return self._parse_batch(response, usernames)
+
+        except Exception as e:
+            print(f"AniList service error: {e}")
+            return {}
+
+    async def _fetch_batch_async(self, usernames):
+        try:
+            response = await async_http.post(
+                self.url, json=self._batch_request(usernames), timeout=10
             )
+            return self._parse_batch(response, usernames)
 
-            return {
-                "type": "anime",
-                "username": user["name"],
-                "days_wasted": days_wasted,
-                "total_episodes": animestats["episodesWatched"],
-                "anime_watching": anime_watching,
-                "anime_completed": anime_completed,
-                "anime_watching_list": anime_watching_list,
-                "anime_completed_list": anime_completed_list,
-                "top_anime_genres": [g["genre"] for g in animestats.get("genres", [])],
-                "favorite_anime": extract_titles(user["favourites"]["anime"]["nodes"]),
-                "chapters_read": mangastats["chaptersRead"],
-                "volumes_read": mangastats["volumesRead"],
-                "manga_reading": manga_reading,
-                "manga_completed": manga_completed,
-                "manga_reading_list": manga_reading_list,
-                "manga_completed_list": manga_completed_list,
-                "top_manga_genres": [g["genre"] for g in mangastats.get("genres", [])],
-                "favorite_manga": extract_titles(user["favourites"]["manga"]["nodes"]),
-                "profile_url": user["siteUrl"],
-            }
         except Exception as e:
             print(f"AniList service error: {e}")
             return {}
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import time
+import weakref
+from urllib.parse import urlsplit
+
+from .breaker import breaker_for_url
+from .deadline import remaining
+from .http_client import RETRY_STATUSES, CircuitOpen, DeadlineExceeded, retry_delay
+from ..utils.metrics import get_metrics
+from ..utils.startup import lazy_import
+
+# One Client Per Event Loop; httpx Clients Cannot Be Shared Across Loops
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+
+    if client is None:
+        httpx = lazy_import("httpx")
+        max_connections = int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", 100))
+        client = httpx.AsyncClient(
+            timeout=float(os.getenv("HTTP_TIMEOUT", 8)),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=1),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def request(method, url, **kwargs):
+    "Async Twin Of PooledSession.request: Deadline, Breaker, Retries And Metrics"
+    breaker = breaker_for_url(url)
+    upstream = breaker.name if breaker else urlsplit(url).hostname
+    metrics = get_metrics()
+    retries = int(os.getenv("HTTP_RETRIES", 2))
+    backoff = float(os.getenv("HTTP_BACKOFF", 0.3))
+    timeout = kwargs.pop("timeout", None) or float(os.getenv("HTTP_TIMEOUT", 8))
+
+    if breaker and not breaker.allow():
+        metrics.inc(
+            "upstream_request_errors_total", upstream=upstream, reason="circuit_open"
+        )
+        raise CircuitOpen(f"Circuit open for {breaker.name}")
+
+    # One Breaker Outcome Per Call, As In PooledSession.request
+    settled = False
+    try:
+        for attempt in range(retries + 1):
+            left = remaining()
+            if left is not None:
+                if left <= 0:
+                    metrics.inc(
+                        "upstream_request_errors_total",
+                        upstream=upstream,
+                        reason="deadline",
+                    )
+                    raise DeadlineExceeded(f"Request deadline passed before {url}")
+                timeout = min(timeout, left)
+
+            started = time.monotonic()
+            try:
+                response = await get_async_client().request(
+                    method, url, timeout=timeout, **kwargs
+                )
+            except Exception:
+                metrics.inc(
+                    "upstream_request_errors_total", upstream=upstream, reason="error"
+                )
+                if breaker:
+                    breaker.record_failure()
+                settled = True
+                raise
+
+            metrics.observe(
+                "upstream_request_seconds",
+                time.monotonic() - started,
+                upstream=upstream,
+                status=f"{response.status_code // 100}xx",
+            )
+
+            failed = response.status_code in RETRY_STATUSES
+            if failed and attempt < retries:
+                # Same Rule As PooledSession._pause: Retry-After, Never Past Deadline
+                retry_after = response.headers.get("Retry-After")
+                delay = retry_delay(backoff, attempt, retry_after)
+                if delay is not None:
+                    await response.aclose()
+                    await asyncio.sleep(delay)
+                    continue
+
+            if breaker:
+                if failed:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success(time.monotonic() - started)
+            settled = True
+            return response
+    finally:
+        # CancelledError (wait_for Timing Out The Fan-Out) Skips except Exception
+        if breaker and not settled:
+            breaker.release()
+
+
+async def get(url, **kwargs):
+    return await request("GET", url, **kwargs)
+
+
+async def post(url, **kwargs):
+    return await request("POST", url, **kwargs)
@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+# Env Defaults For Scripts Without An App; create_app Applies Config Over Them
+_settings = {
+    "failure_threshold": int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5)),
+    "reset_timeout": float(os.getenv("BREAKER_RESET_TIMEOUT", 30)),
+    "slow_call": float(os.getenv("BREAKER_SLOW_CALL", 8)),
+    "trial_timeout": float(os.getenv("BREAKER_TRIAL_TIMEOUT", 30)),
+}
+
+# Upstream hosts each provider's breaker guards
+HOST_PROVIDERS = {
+    "api.henrikdev.xyz": "valorant",
+    "graphql.anilist.co": "anime",
+    "api.steampowered.com": "steam",
+    "api.spotify.com": "spotify",
+    "accounts.spotify.com": "spotify",
+}
+
+
+class CircuitBreaker:
+    "Opens After Repeated Failures Or Slow Calls, Then Lets One Trial Call Through"
+
+    def __init__(
+        self, name, failure_threshold=5, reset_timeout=30, slow_call=8, trial_timeout=30
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self.trial_timeout = trial_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.trial_started = None
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.lock = threading.Lock()
+
+    def is_open(self):
+        "True While Calls Are Being Refused, Without Claiming The Trial Slot"
+        with self.lock:
+            return (
+                self.state == "open"
+                and time.monotonic() - self.opened_at < self.reset_timeout
+            )
+
+    def allow(self):
+        with self.lock:
+            if self.state == "closed":
+                return True
+
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.total_rejected += 1
+                    return False
+                self.state = "half_open"
+
+            # A Trial That Never Reported Back (Lost Thread, Hung Call) Expires
+            if (
+                self.trial_in_flight
+                and time.monotonic() - self.trial_started < self.trial_timeout
+            ):
+                self.total_rejected += 1
+                return False
+
+            self.trial_in_flight = True
+            self.trial_started = time.monotonic()
+            return True
+
+    def record_success(self, duration=0):
+        if duration > self.slow_call:
+            self.record_failure()
+            return
+
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.total_failures += 1
+            self.trial_in_flight = False
+
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        "Frees A Claimed Trial Slot When The Call Ended Without An Outcome"
+        with self.lock:
+            self.trial_in_flight = False
+
+    def to_dict(self):
+        with self.lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = max(
+                    0, round(self.reset_timeout - (time.monotonic() - self.opened_at), 1)
+                )
+
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "total_failures": self.total_failures,
+                "total_rejected": self.total_rejected,
+                "retry_in": retry_in,
+            }
+
+
+def get_breaker(name):
+    breaker = _breakers.get(name)
+
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **_settings)
+                _breakers[name] = breaker
+    return breaker
+
+
+def configure_breakers(config):
+    "Applies BREAKER_* From App Config To Current And Future Breakers"
+    keys = {
+        "failure_threshold": ("BREAKER_FAILURE_THRESHOLD", int),
+        "reset_timeout": ("BREAKER_RESET_TIMEOUT", float),
+        "slow_call": ("BREAKER_SLOW_CALL", float),
+        "trial_timeout": ("BREAKER_TRIAL_TIMEOUT", float),
+    }
+
+    with _breakers_lock:
+        for attr, (key, cast) in keys.items():
+            if config.get(key) is not None:
+                _settings[attr] = cast(config[key])
+
+        for breaker in _breakers.values():
+            with breaker.lock:
+                for attr, value in _settings.items():
+                    setattr(breaker, attr, value)
+
+
+# Overridden Base URLs (Staging, Local Stubs) Get The Same Breakers
+BASE_URL_PROVIDERS = {
+    "VALORANT_API_URL": "valorant",
+    "ANILIST_API_URL": "anime",
+    "STEAM_API_URL": "steam",
+    "SPOTIFY_API_URL": "spotify",
+}
+
+
+def provider_for_url(url):
+    parts = urlsplit(url)
+    provider = HOST_PROVIDERS.get(parts.hostname or "")
+    if provider:
+        return provider
+
+    for env, name in BASE_URL_PROVIDERS.items():
+        base = os.getenv(env)
+        if base and urlsplit(base).netloc == parts.netloc:
+            return name
+    return None
+
+
+def breaker_for_url(url):
+    provider = provider_for_url(url)
+    return get_breaker(provider) if provider else None
+
+
+def breaker_states():
+    for provider in sorted(set(HOST_PROVIDERS.values())):
+        get_breaker(provider)
+    return {name: breaker.to_dict() for name, breaker in sorted(_breakers.items())}
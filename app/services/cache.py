@@ -0,0 +1,229 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from ..utils.metrics import get_metrics
+
+_cache = None
+_cache_lock = threading.Lock()
+
+DEFAULT_TTLS = {
+    "anime": 900,
+    "steam": 900,
+    "valorant": 300,
+}
+
+
+class MemoryBackend:
+    "Per-Process LRU With Expiry"
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (value, time.time() + ttl)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class SQLiteBackend:
+    "LRU With Expiry In A SQLite File Shared By All Workers On The Host"
+
+    def __init__(self, path, max_size=1024):
+        self.path = path
+        self.max_size = max_size
+        self.local = threading.local()
+
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS provider_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_provider_cache_accessed "
+                "ON provider_cache (accessed_at)"
+            )
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value, expires_at FROM provider_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        if row[1] <= now:
+            conn.execute("DELETE FROM provider_cache WHERE key = ?", (key,))
+            return None
+
+        conn.execute(
+            "UPDATE provider_cache SET accessed_at = ? WHERE key = ?", (now, key)
+        )
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO provider_cache (key, value, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now + ttl, now),
+        )
+        conn.execute(
+            "DELETE FROM provider_cache WHERE expires_at <= ? OR key IN ("
+            "SELECT key FROM provider_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (now, self.max_size),
+        )
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM provider_cache WHERE key = ?", (key,))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM provider_cache")
+
+
+class ProviderCache:
+    "Caches Provider Results By (Provider, Identifier, Region)"
+
+    def __init__(self, backend, ttls=None):
+        self.backend = backend
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @staticmethod
+    def key(provider, identifier, region=None):
+        identifier = str(identifier or "").strip().lower()
+        region = str(region or "").strip().lower()
+        return f"{provider}:{region}:{identifier}"
+
+    def enabled(self, provider, identifier):
+        return self.ttls.get(provider, 0) > 0 and bool(identifier)
+
+    def get(self, provider, identifier, region=None):
+        try:
+            value = self.backend.get(self.key(provider, identifier, region))
+        except Exception as e:
+            print(f"Provider cache read error: {e}")
+            value = None
+
+        if value is not None:
+            self.hits[provider] += 1
+        else:
+            self.misses[provider] += 1
+
+        get_metrics().inc(
+            "cache_requests_total",
+            cache="provider",
+            provider=provider,
+            result="miss" if value is None else "hit",
+        )
+        return value
+
+    def set(self, provider, identifier, value, region=None):
+        # Empty Results Mean The Upstream Failed, Never Pin Those
+        if not value:
+            return
+
+        try:
+            self.backend.set(
+                self.key(provider, identifier, region), value, self.ttls[provider]
+            )
+        except Exception as e:
+            print(f"Provider cache write error: {e}")
+
+    def get_or_fetch(self, provider, identifier, fetch, region=None):
+        if not self.enabled(provider, identifier):
+            return fetch()
+
+        value = self.get(provider, identifier, region)
+        if value is None:
+            value = fetch()
+            self.set(provider, identifier, value, region)
+
+        return value
+
+    async def get_or_fetch_async(self, provider, identifier, fetch, region=None):
+        "get_or_fetch For A Coroutine Function `fetch`"
+        if not self.enabled(provider, identifier):
+            return await fetch()
+
+        # The SQLite Backend Blocks, So Lookups And Writes Stay Off The Event Loop
+        value = await asyncio.to_thread(self.get, provider, identifier, region)
+        if value is None:
+            value = await fetch()
+            await asyncio.to_thread(self.set, provider, identifier, value, region)
+
+        return value
+
+    def stats(self):
+        providers = set(self.hits) | set(self.misses)
+        return {
+            p: {"hits": self.hits[p], "misses": self.misses[p]} for p in sorted(providers)
+        }
+
+
+def get_cache():
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_size = int(os.getenv("PROVIDER_CACHE_SIZE", 1024))
+
+                if os.getenv("PROVIDER_CACHE_BACKEND", "memory").lower() == "sqlite":
+                    backend = SQLiteBackend(
+                        os.getenv("PROVIDER_CACHE_PATH", "provider_cache.db"), max_size
+                    )
+                else:
+                    backend = MemoryBackend(max_size)
+
+                ttls = {
+                    provider: int(os.getenv(f"PROVIDER_CACHE_TTL_{provider.upper()}", ttl))
+                    for provider, ttl in DEFAULT_TTLS.items()
+                }
+                _cache = ProviderCache(backend, ttls)
+    return _cache
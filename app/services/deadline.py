@@ -0,0 +1,32 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+_deadline = contextvars.ContextVar("roast_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds=None, until=None):
+    "Sets The Monotonic Deadline Every Upstream Call In This Context Must Meet"
+    if until is None:
+        until = time.monotonic() + seconds if seconds else None
+
+    token = _deadline.set(until)
+    try:
+        yield until
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline():
+    return _deadline.get()
+
+
+def remaining():
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    "executor.submit, But The Worker Thread Sees This Context's Deadline"
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -1,19 +1,50 @@
+import asyncio
 import os
-import google.generativeai as genai
+import threading
+
+from .deadline import remaining
+from ..utils.startup import lazy_import
+
+_roaster = None
+_roaster_lock = threading.Lock()
 
 
 class GeminiRoaster:
-    def __init__(self, api_key=None):
+    model_name = "gemini-2.0-flash"
+
+    def __init__(self, api_key=None, max_output_tokens=None, temperature=None):
         api_key = api_key or os.getenv("GEMINI_API_KEY")
 
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY Not Configured!")
 
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        if max_output_tokens is None:
+            max_output_tokens = os.getenv("GEMINI_MAX_OUTPUT_TOKENS", 400)
+        if temperature is None:
+            temperature = os.getenv("GEMINI_TEMPERATURE")
 
-    def roast(self, combined_prompt_block):
-        prompt = f"""
+        generation_config = {"max_output_tokens": int(max_output_tokens)}
+        if temperature not in (None, ""):
+            generation_config["temperature"] = float(temperature)
+
+        genai = lazy_import("google.generativeai")
+        endpoint = os.getenv("GEMINI_API_ENDPOINT")
+        self.transport = "rest" if endpoint else "grpc"
+        if endpoint:
+            # REST Transport So A Plain HTTP Endpoint (Like A Local Stub) Works
+            genai.configure(
+                api_key=api_key,
+                transport="rest",
+                client_options={"api_endpoint": endpoint},
+            )
+        else:
+            genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(
+            self.model_name, generation_config=generation_config
+        )
+
+    def build_prompt(self, combined_prompt_block):
+        return f"""
 You are a professional roaster with a sharp, clever, comedic edge.
 Given the following user data from games, music and anime, produce a single savage roast.
 It must be:
@@ -27,5 +58,75 @@ User Data Block:
 {combined_prompt_block}
 
 Return only the roast paragraph(s)."""
-        resp = self.model.generate_content(prompt)
+
+    @staticmethod
+    def request_options():
+        "Caps The Generation At Whatever Is Left Of The Request's Deadline"
+        left = remaining()
+        if left is None:
+            return {}
+        if left <= 0:
+            raise TimeoutError("Roast deadline passed before generation")
+        return {"timeout": left}
+
+    def roast(self, combined_prompt_block):
+        resp = self.model.generate_content(
+            self.build_prompt(combined_prompt_block),
+            request_options=self.request_options(),
+        )
+        return resp.text.strip()
+
+    async def roast_async(self, combined_prompt_block):
+        if self.transport == "rest":
+            # The SDK's Async Client Speaks gRPC Only; Keep The Loop Free With A Thread
+            return await asyncio.to_thread(self.roast, combined_prompt_block)
+
+        resp = await self.model.generate_content_async(
+            self.build_prompt(combined_prompt_block),
+            request_options=self.request_options(),
+        )
         return resp.text.strip()
+
+    def roast_stream(self, combined_prompt_block):
+        resp = self.model.generate_content(
+            self.build_prompt(combined_prompt_block),
+            stream=True,
+            request_options=self.request_options(),
+        )
+
+        produced = False
+        for chunk in resp:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+
+            if text:
+                produced = True
+                yield text
+
+        if not produced:
+            # Same Failure roast() Hits When resp.text Has Nothing (e.g. Blocked Output)
+            raise ValueError("Gemini returned no roast text")
+
+    def warm_up(self):
+        # Opens The Channel To The API Without Paying For A Generation
+        self.model.count_tokens("warm up")
+
+
+def get_roaster():
+    "Returns The Worker's Shared GeminiRoaster, Building It On First Use"
+    global _roaster
+
+    if _roaster is None:
+        with _roaster_lock:
+            if _roaster is None:
+                _roaster = GeminiRoaster()
+    return _roaster
+
+
+def warm_up_roaster():
+    try:
+        get_roaster().warm_up()
+    except Exception as e:
+        print(f"Gemini warm-up failed: {e}")
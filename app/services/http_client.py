@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .breaker import breaker_for_url
+from .deadline import remaining
+from ..utils.metrics import get_metrics
+
+_session = None
+_lock = threading.Lock()
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    pass
+
+
+class CircuitOpen(requests.exceptions.ConnectionError):
+    pass
+
+
+class PooledSession(requests.Session):
+    "Keep-Alive Session With Pooled Adapters And A Default Timeout"
+
+    def __init__(self, timeout=None, pool_size=None, retries=None, backoff=None):
+        super().__init__()
+        self.timeout = timeout or float(os.getenv("HTTP_TIMEOUT", 8))
+        self.retries = int(os.getenv("HTTP_RETRIES", 2)) if retries is None else retries
+        self.backoff = (
+            float(os.getenv("HTTP_BACKOFF", 0.3)) if backoff is None else backoff
+        )
+
+        # Retries Happen In request() So Every Attempt And Backoff Sees The Deadline
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=pool_size or int(os.getenv("HTTP_POOL_SIZE", 10)),
+            max_retries=0,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        timeout = kwargs.pop("timeout", None) or self.timeout
+        breaker = breaker_for_url(url)
+        upstream = breaker.name if breaker else urlsplit(url).hostname
+        metrics = get_metrics()
+
+        if breaker and not breaker.allow():
+            metrics.inc(
+                "upstream_request_errors_total", upstream=upstream, reason="circuit_open"
+            )
+            raise CircuitOpen(f"Circuit open for {breaker.name}")
+
+        # One Breaker Outcome Per Call; Retries Ride Out Blips Without Counting Each
+        settled = False
+        try:
+            for attempt in range(self.retries + 1):
+                left = remaining()
+                if left is not None:
+                    if left <= 0:
+                        metrics.inc(
+                            "upstream_request_errors_total",
+                            upstream=upstream,
+                            reason="deadline",
+                        )
+                        raise DeadlineExceeded(f"Request deadline passed before {url}")
+                    kwargs["timeout"] = min(timeout, left)
+                else:
+                    kwargs["timeout"] = timeout
+
+                started = time.monotonic()
+                try:
+                    response = super().request(method, url, **kwargs)
+                except Exception as e:
+                    metrics.inc(
+                        "upstream_request_errors_total", upstream=upstream, reason="error"
+                    )
+                    retryable = isinstance(e, RETRY_ERRORS) and attempt < self.retries
+                    if retryable and self._pause(attempt):
+                        continue
+
+                    if breaker:
+                        breaker.record_failure()
+                    settled = True
+                    raise
+
+                metrics.observe(
+                    "upstream_request_seconds",
+                    time.monotonic() - started,
+                    upstream=upstream,
+                    status=f"{response.status_code // 100}xx",
+                )
+
+                failed = response.status_code in RETRY_STATUSES
+                if failed and attempt < self.retries:
+                    if self._pause(attempt, response.headers.get("Retry-After")):
+                        response.close()
+                        continue
+
+                if breaker:
+                    if failed:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success(time.monotonic() - started)
+                settled = True
+                return response
+        finally:
+            # Exits Without An Outcome (Deadline) Must Not Keep The Half-Open Trial
+            if breaker and not settled:
+                breaker.release()
+
+    def _pause(self, attempt, retry_after=None):
+        "Sleeps Before The Next Attempt; False When The Deadline Would Not Survive It"
+        delay = retry_delay(self.backoff, attempt, retry_after)
+        if delay is None:
+            return False
+
+        time.sleep(delay)
+        return True
+
+
+def retry_delay(backoff, attempt, retry_after=None):
+    "Backoff (Or Retry-After, If Longer) Before The Next Attempt; None Past The Deadline"
+    delay = backoff * 2**attempt
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+
+    left = remaining()
+    if left is not None and delay >= left:
+        return None
+    return delay
+
+
+class BorrowedSession(requests.Session):
+    "The Pooled Session For Libraries That Close Theirs In __del__; close() Does Nothing"
+
+    def request(self, method, url, **kwargs):
+        return get_session().request(method, url, **kwargs)
+
+    def close(self):
+        pass
+
+
+def get_session():
+    global _session
+
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = PooledSession()
+    return _session
+
+
+def borrowed_session():
+    # spotipy Closes Its Session When Garbage-Collected; Never Give It The Singleton
+    return BorrowedSession()
@@ -0,0 +1,138 @@
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from ..models.database import db, RoastJob
+
+
+class RoastJobQueue:
+    "Database-Backed Job Queue Drained By Background Threads In Each Worker"
+
+    def __init__(self):
+        self.handler = None
+        self.wakeup = threading.Event()
+        self.threads = []
+
+    def task(self, fn):
+        self.handler = fn
+        return fn
+
+    def init_app(self, app):
+        self.poll_interval = float(app.config.get("ROAST_JOB_POLL_INTERVAL", 1.0))
+        self.stale_after = timedelta(
+            seconds=int(app.config.get("ROAST_JOB_STALE_SECONDS", 300))
+        )
+        self.max_attempts = int(app.config.get("ROAST_JOB_MAX_ATTEMPTS", 3))
+        self.retention = timedelta(
+            seconds=int(app.config.get("ROAST_JOB_RETENTION_SECONDS", 86400))
+        )
+        self.last_purge = 0
+
+        for i in range(int(app.config.get("ROAST_JOB_WORKERS", 0))):
+            thread = threading.Thread(
+                target=self._work, args=(app,), name=f"roast-job-{i}", daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def notify(self):
+        self.wakeup.set()
+
+    def _claim(self):
+        now = datetime.utcnow()
+
+        # Jobs Left "running" By A Dead Worker Are Picked Up Again
+        claimable = db.or_(
+            RoastJob.status == "queued",
+            db.and_(
+                RoastJob.status == "running",
+                RoastJob.started_at < now - self.stale_after,
+            ),
+        )
+        job = RoastJob.query.filter(claimable).order_by(RoastJob.created_at).first()
+        if not job:
+            return None
+
+        if job.attempts >= self.max_attempts:
+            job.status = "failed"
+            job.error = job.error or "Job abandoned after repeated attempts."
+            job.finished_at = now
+            self._scrub(job)
+            db.session.commit()
+            return None
+
+        claimed = (
+            RoastJob.query.filter(RoastJob.id == job.id, claimable)
+            .filter(RoastJob.attempts == job.attempts)
+            .update(
+                {
+                    "status": "running",
+                    "started_at": now,
+                    "attempts": job.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.session.commit()
+
+        if not claimed:
+            return None
+
+        db.session.refresh(job)
+        return job
+
+    def _run_one(self):
+        job = self._claim()
+        if not job:
+            return False
+
+        try:
+            self.handler(job)
+            job.status = "done"
+        except Exception as e:
+            traceback.print_exc()
+            db.session.rollback()
+            job.status = "failed"
+            job.error = str(e)
+
+        job.finished_at = datetime.utcnow()
+        self._scrub(job)
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def _scrub(job):
+        # The Queued Spotify Access Token Is Only Needed While The Job Runs
+        if job.payload and "spotify" in job.payload:
+            job.payload = {k: v for k, v in job.payload.items() if k != "spotify"}
+
+    def _purge(self):
+        "Deletes Finished Jobs Older Than The Retention Window, At Most Once A Minute"
+        if time.monotonic() - self.last_purge < 60:
+            return
+        self.last_purge = time.monotonic()
+
+        cutoff = datetime.utcnow() - self.retention
+        RoastJob.query.filter(
+            RoastJob.status.in_(("done", "failed")), RoastJob.finished_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+    def _work(self, app):
+        while True:
+            ran = False
+            try:
+                with app.app_context():
+                    ran = self._run_one()
+                    if not ran:
+                        self._purge()
+            except Exception as e:
+                print(f"Roast job worker error: {e}")
+
+            if not ran:
+                self.wakeup.wait(self.poll_interval)
+                self.wakeup.clear()
+
+
+roast_jobs = RoastJobQueue()
@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import os
+from datetime import datetime
+
+from ..models.database import db, RoastCompletion
+from ..utils.metrics import get_metrics
+
+
+def prompt_hash(model_name, prompt):
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode()).hexdigest()
+
+
+def _variants(variants):
+    if variants is None:
+        variants = int(os.getenv("ROAST_CACHE_VARIANTS", 1))
+    return variants
+
+
+def _lookup(roaster, combined_prompt_block, variants):
+    key = prompt_hash(roaster.model_name, roaster.build_prompt(combined_prompt_block))
+    stored = RoastCompletion.query.filter_by(prompt_hash=key)
+
+    if stored.count() < variants:
+        get_metrics().inc("cache_requests_total", cache="roast_memo", result="miss")
+        return key, None
+
+    get_metrics().inc("cache_requests_total", cache="roast_memo", result="hit")
+
+    completion = stored.order_by(RoastCompletion.last_served_at.asc()).first()
+    completion.served_count += 1
+    completion.last_served_at = datetime.utcnow()
+    return key, completion.roast_text
+
+
+def _store(roaster, key, roast_text):
+    db.session.add(
+        RoastCompletion(
+            prompt_hash=key,
+            model=roaster.model_name,
+            roast_text=roast_text,
+            served_count=1,
+        )
+    )
+
+
+def memoized_roast(roaster, combined_prompt_block, variants=None):
+    "Reuses Stored Completions For Byte-Identical Prompts"
+
+    # Keep Up To `variants` Roasts Per Prompt, Then Rotate; 1 = Always Reuse, 0 = Off
+    variants = _variants(variants)
+    if variants <= 0:
+        return roaster.roast(combined_prompt_block)
+
+    key, roast_text = _lookup(roaster, combined_prompt_block, variants)
+    if roast_text is None:
+        roast_text = roaster.roast(combined_prompt_block)
+        _store(roaster, key, roast_text)
+
+    return roast_text
+
+
+async def memoized_roast_async(roaster, combined_prompt_block, variants=None):
+    "memoized_roast For The Async Pipeline; Lookups Run Off The Event Loop"
+
+    variants = _variants(variants)
+    if variants <= 0:
+        return await roaster.roast_async(combined_prompt_block)
+
+    key, roast_text = await asyncio.to_thread(
+        _lookup, roaster, combined_prompt_block, variants
+    )
+    if roast_text is None:
+        roast_text = await roaster.roast_async(combined_prompt_block)
+        await asyncio.to_thread(_store, roaster, key, roast_text)
+
+    return roast_text
+
+
+def memoized_roast_stream(roaster, combined_prompt_block, variants=None):
+    "Streaming Counterpart Of memoized_roast, Yields Text Chunks"
+
+    variants = _variants(variants)
+    if variants <= 0:
+        yield from roaster.roast_stream(combined_prompt_block)
+        return
+
+    key, roast_text = _lookup(roaster, combined_prompt_block, variants)
+    if roast_text is not None:
+        yield roast_text
+        return
+
+    chunks = []
+    for chunk in roaster.roast_stream(combined_prompt_block):
+        chunks.append(chunk)
+        yield chunk
+
+    roast_text = "".join(chunks).strip()
+    if roast_text:
+        _store(roaster, key, roast_text)
@@ -1,75 +1,180 @@
+import asyncio
 import os
+import threading
 import time
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+from collections import OrderedDict
 from flask import session
 
+from . import async_http
+from .aggregator import get_subrequest_executor
+from .deadline import submit_in_context
+from .http_client import borrowed_session
+from ..utils.startup import lazy_import
+
+_oauth = None
+_oauth_lock = threading.Lock()
+
+# refresh_token -> refreshed token info, so concurrent and repeated roasts
+# by the same user share one refresh round-trip per token lifetime
+_refreshed = OrderedDict()
+_refresh_locks = {}
+_refresh_guard = threading.Lock()
+MAX_REFRESHED = 1024
+
+
+def get_oauth_manager():
+    global _oauth
+
+    if _oauth is None:
+        with _oauth_lock:
+            if _oauth is None:
+                _oauth = lazy_import("spotipy.oauth2").SpotifyOAuth(
+                    client_id=os.getenv("SPOTIFY_CLIENT_ID"),
+                    client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
+                    redirect_uri=os.getenv(
+                        "SPOTIFY_REDIRECT_URI",
+                        "http://localhost:8888/spotify/callback",
+                    ),
+                    scope=os.getenv(
+                        "SPOTIFY_SCOPE",
+                        "user-read-private user-read-email user-top-read user-read-recently-played",
+                    ),
+                    cache_path=None,
+                    show_dialog=False,
+                    requests_session=borrowed_session(),
+                )
+    return _oauth
+
+
+def is_expiring(token_info):
+    expires_at = token_info.get("expires_at")
+    return bool(expires_at) and time.time() > (expires_at - 60)
+
+
+def refresh_token_info(token_info):
+    refresh_token = token_info["refresh_token"]
+
+    with _refresh_guard:
+        lock = _refresh_locks.setdefault(refresh_token, threading.Lock())
+
+    with lock:
+        cached = _refreshed.get(refresh_token)
+        if cached and not is_expiring(cached):
+            return cached
+
+        new_tokens = get_oauth_manager().refresh_access_token(refresh_token)
+        refreshed = {**token_info, **new_tokens}
+
+        with _refresh_guard:
+            _refreshed[refresh_token] = refreshed
+            _refreshed.move_to_end(refresh_token)
+
+            while len(_refreshed) > MAX_REFRESHED:
+                stale, _ = _refreshed.popitem(last=False)
+                _refresh_locks.pop(stale, None)
+
+        return refreshed
+
 
 class SpotifyService:
     def __init__(self, token_info=None):
         token_info = token_info or session.get("spotify_token_info")
+        self.access_token = None
 
         if token_info:
-            expires_at = token_info.get("expires_at")
             access_token = token_info.get("access_token")
-            refresh_token = token_info.get("refresh_token")
 
-            if expires_at and time.time() > (expires_at - 60) and refresh_token:
+            if is_expiring(token_info) and token_info.get("refresh_token"):
                 try:
-                    oauth = SpotifyOAuth(
-                        client_id=os.getenv("SPOTIFY_CLIENT_ID"),
-                        client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
-                        redirect_uri=os.getenv(
-                            "SPOTIFY_REDIRECT_URI",
-                            "http://localhost:8888/spotify/callback",
-                        ),
-                        scope=os.getenv(
-                            "SPOTIFY_SCOPE",
-                            "user-read-private user-read-email user-top-read user-read-recently-played",
-                        ),
-                        cache_path=None,
-                        show_dialog=False,
-                    )
-                    new_tokens = oauth.refresh_access_token(refresh_token)
-
-                    session["spotify_token_info"] = {**token_info, **new_tokens}
-                    access_token = new_tokens.get("access_token", access_token)
+                    refreshed = refresh_token_info(token_info)
+
+                    session["spotify_token_info"] = refreshed
+                    access_token = refreshed.get("access_token", access_token)
 
                 except Exception:
                     session.pop("spotify_token_info", None)
                     self.spotify_app = None
                     return
 
-            self.spotify_app = spotipy.Spotify(auth=access_token)
+            self.access_token = access_token
+            self.spotify_app = lazy_import("spotipy").Spotify(
+                auth=access_token, requests_session=borrowed_session()
+            )
+            self.spotify_app.prefix = os.getenv(
+                "SPOTIFY_API_URL", self.spotify_app.prefix
+            )
         else:
             self.spotify_app = None
 
     def is_ready(self):
         return self.spotify_app is not None
 
-    def get_roast_profile_data(self):
-        if not self.is_ready():
-            return {}
-        data = {}
+    @staticmethod
+    def format_artists(artists_raw):
+        return [
+            f"{a['name']} ({', '.join(a.get('genres', [])[:2])})"
+            for a in artists_raw.get("items", [])
+        ]
 
+    @staticmethod
+    def format_tracks(recent_raw):
+        return [
+            f"{i['track']['name']} by {i['track']['artists'][0]['name']}"
+            for i in recent_raw.get("items", [])
+        ]
+
+    def _top_artists(self):
         try:
-            artists_raw = self.spotify_app.current_user_top_artists(
-                limit=10, time_range="long_term"
+            return self.format_artists(
+                self.spotify_app.current_user_top_artists(
+                    limit=10, time_range="long_term"
+                )
             )
-            data["top_artists"] = [
-                f"{a['name']} ({', '.join(a.get('genres', [])[:2])})"
-                for a in artists_raw.get("items", [])
-            ]
         except Exception:
-            data["top_artists"] = []
+            return []
 
+    def _recent_tracks(self):
         try:
-            recent_raw = self.spotify_app.current_user_recently_played(limit=10)
-            data["recent_tracks"] = [
-                f"{i['track']['name']} by {i['track']['artists'][0]['name']}"
-                for i in recent_raw.get("items", [])
-            ]
+            return self.format_tracks(
+                self.spotify_app.current_user_recently_played(limit=10)
+            )
+        except Exception:
+            return []
+
+    async def _get_async(self, path, params, formatter):
+        try:
+            response = await async_http.get(
+                f"{self.spotify_app.prefix}{path}",
+                params=params,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+            )
+            response.raise_for_status()
+            return formatter(response.json())
         except Exception:
-            data["recent_tracks"] = []
+            return []
+
+    def get_roast_profile_data(self):
+        if not self.is_ready():
+            return {}
+
+        recent_future = submit_in_context(get_subrequest_executor(), self._recent_tracks)
+        data = {"top_artists": self._top_artists()}
+        data["recent_tracks"] = recent_future.result()
 
         return data
+
+    async def get_roast_profile_data_async(self):
+        if not self.is_ready():
+            return {}
+
+        top_artists, recent_tracks = await asyncio.gather(
+            self._get_async(
+                "me/top/artists",
+                {"limit": 10, "time_range": "long_term"},
+                self.format_artists,
+            ),
+            self._get_async(
+                "me/player/recently-played", {"limit": 10}, self.format_tracks
+            ),
+        )
+        return {"top_artists": top_artists, "recent_tracks": recent_tracks}
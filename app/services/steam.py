@@ -1,18 +1,116 @@
+import asyncio
+import codecs
+import heapq
+import json
 import os
-import requests
+
+from . import async_http
+from .cache import get_cache
+from .http_client import get_session
+
+OWNED_GAMES_PATH = "/IPlayerService/GetOwnedGames/v0001/"
+
+
+def iter_json_array(chunks, key):
+    "Yields Items Of The First `key` Array In A Streamed JSON Document"
+    decoder = json.JSONDecoder()
+    marker = f'"{key}"'
+    chunks = iter(chunks)
+    buffer = ""
+
+    while True:
+        start = buffer.find(marker)
+        bracket = buffer.find("[", start + len(marker)) if start != -1 else -1
+        if bracket != -1:
+            buffer = buffer[bracket + 1 :]
+            break
+
+        if start == -1:
+            buffer = buffer[-len(marker) :]
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            return
+        buffer += chunk
+
+    pos = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        yield item
+
+
+def summarize_owned_games(games, top_n=10):
+    "Total Minutes And The top_n Most Played Games In One Pass With A Bounded Heap"
+    total_minutes = 0
+    heap = []
+
+    for index, game in enumerate(games):
+        minutes = game.get("playtime_forever", 0)
+        total_minutes += minutes
+
+        # -index Keeps Earlier Games First On Ties, Like A Stable Sort Would
+        entry = (minutes, -index, game.get("appid"), game.get("name"))
+        if len(heap) < top_n:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    top_games = [
+        {"appid": appid, "name": name, "playtime_forever": minutes}
+        for minutes, _, appid, name in sorted(heap, reverse=True)
+    ]
+    return total_minutes, top_games
+
+
+def game_name(game, names=None):
+    # Owned Games Come Without Names; If The Name Lookup Failed, Fall Back To The App Id
+    appid = game.get("appid")
+    return (names or {}).get(appid) or game.get("name") or f"App {appid}"
+
+
+def format_top_games(top_games, names=None):
+    return [
+        f"{game_name(g, names)} "
+        f"({round(g['playtime_forever'] / 60, 1)}h)"
+        for g in top_games
+    ]
+
+
+def format_recent_games(games, limit=10):
+    return [
+        f"{game_name(g)} ({round(g.get('playtime_2weeks', 0) / 60, 1)}h last 2w)"
+        for g in games[:limit]
+    ]
 
 
 class SteamService:
     def __init__(self):
         self.api_key = os.getenv("STEAM_API_KEY")
+        self.base_url = os.getenv("STEAM_API_URL", "https://api.steampowered.com")
+        self.http = get_session()
 
     def is_ready(self):
         return bool(self.api_key)
 
     def _resolve_vanity(self, vanity):
         try:
-            resp = requests.get(
-                "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v0001/",
+            resp = self.http.get(
+                f"{self.base_url}/ISteamUser/ResolveVanityURL/v0001/",
                 params={"key": self.api_key, "vanityurl": vanity},
                 timeout=8,
             )
@@ -23,10 +121,44 @@ class SteamService:
             pass
         return None
 
+    def _fetch_app_names(self, steam_id, appids):
+        if not appids:
+            return {}
+
+        try:
+            resp = self.http.get(
+                f"{self.base_url}{OWNED_GAMES_PATH}",
+                params=self._app_names_params(steam_id, appids),
+                timeout=8,
+            )
+            games = resp.json().get("response", {}).get("games", [])
+            return {g.get("appid"): g.get("name") for g in games}
+        except Exception:
+            return {}
+
+    def _app_names_params(self, steam_id, appids):
+        return {
+            "key": self.api_key,
+            "input_json": json.dumps(
+                {
+                    "steamid": int(steam_id),
+                    "include_appinfo": True,
+                    "include_played_free_games": True,
+                    "appids_filter": appids,
+                }
+            ),
+        }
+
     def get_roast_data(self, steam_id=None, vanity=None):
         if not self.is_ready():
             return {}
 
+        identifier = steam_id or (f"vanity:{vanity}" if vanity else None)
+        return get_cache().get_or_fetch(
+            "steam", identifier, lambda: self._fetch_roast_data(steam_id, vanity)
+        )
+
+    def _fetch_roast_data(self, steam_id=None, vanity=None):
         if not steam_id and vanity:
             steam_id = self._resolve_vanity(vanity)
 
@@ -34,58 +166,44 @@ class SteamService:
             return {}
 
         # Get player summary (name, profile, etc.)
-        player_name = None
-        profile_url = None
         try:
-            summary_resp = requests.get(
-                "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002/",
+            summary_resp = self.http.get(
+                f"{self.base_url}/ISteamUser/GetPlayerSummaries/v0002/",
                 params={"key": self.api_key, "steamids": steam_id},
                 timeout=8,
             )
-            summary_data = summary_resp.json().get("response", {})
-            players = summary_data.get("players", [])
-            if players:
-                player = players[0]
-                player_name = player.get("personaname")
-                profile_url = player.get("profileurl")
+            summary = summary_resp.json().get("response", {})
         except Exception:
-            pass
+            summary = {}
 
-        # Owned games
+        # Owned games, streamed without appinfo so huge libraries stay small
         try:
-            owned_resp = requests.get(
-                "https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/",
+            with self.http.get(
+                f"{self.base_url}{OWNED_GAMES_PATH}",
                 params={
                     "key": self.api_key,
                     "steamid": steam_id,
-                    "include_appinfo": 1,
                     "include_played_free_games": 1,
                     "format": "json",
                 },
                 timeout=10,
-            )
-            owned = owned_resp.json().get("response", {})
+                stream=True,
+            ) as owned_resp:
+                text = codecs.getincrementaldecoder("utf-8")()
+                chunks = (text.decode(c) for c in owned_resp.iter_content(65536))
+                total_minutes, top_games = summarize_owned_games(
+                    iter_json_array(chunks, "games"), 10
+                )
         except Exception:
-            owned = {}
+            total_minutes, top_games = 0, []
 
-        games = owned.get("games", [])
-        total_hours = (
-            round(sum(g.get("playtime_forever", 0) for g in games) / 60, 1)
-            if games
-            else 0
-        )
-        top_games = sorted(
-            games, key=lambda g: g.get("playtime_forever", 0), reverse=True
-        )[:10]
-        top_games_fmt = [
-            f"{g.get('name')} ({round(g.get('playtime_forever', 0) / 60, 1)}h)"
-            for g in top_games
-        ]
+        # Names only for the games we actually show
+        names = self._fetch_app_names(steam_id, [g["appid"] for g in top_games])
 
         # Recent games
         try:
-            recent_resp = requests.get(
-                "https://api.steampowered.com/IPlayerService/GetRecentlyPlayedGames/v0001/",
+            recent_resp = self.http.get(
+                f"{self.base_url}/IPlayerService/GetRecentlyPlayedGames/v0001/",
                 params={"key": self.api_key, "steamid": steam_id, "format": "json"},
                 timeout=8,
             )
@@ -93,17 +211,94 @@ class SteamService:
         except Exception:
             recent = {}
 
-        recent_fmt = [
-            f"{g.get('name')} ({round(g.get('playtime_2weeks', 0) / 60, 1)}h last 2w)"
-            for g in recent.get("games", [])[:10]
-        ]
+        return self._result(steam_id, summary, total_minutes, top_games, names, recent)
+
+    def _result(self, steam_id, summary, total_minutes, top_games, names, recent):
+        players = summary.get("players", [])
+        player = players[0] if players else {}
 
         return {
             "steam_id": steam_id,
-            "player_name": player_name,
-            "profile_url": profile_url,
-            "total_playtime_hours": total_hours,
-            "top_games": top_games_fmt,
-            "recent_games": recent_fmt,
+            "player_name": player.get("personaname"),
+            "profile_url": player.get("profileurl"),
+            "total_playtime_hours": round(total_minutes / 60, 1) if top_games else 0,
+            "top_games": format_top_games(top_games, names),
+            "recent_games": format_recent_games(recent.get("games", [])),
             "type": "steam",
         }
+
+    async def get_roast_data_async(self, steam_id=None, vanity=None):
+        if not self.is_ready():
+            return {}
+
+        identifier = steam_id or (f"vanity:{vanity}" if vanity else None)
+        return await get_cache().get_or_fetch_async(
+            "steam",
+            identifier,
+            lambda: self._fetch_roast_data_async(steam_id, vanity),
+        )
+
+    async def _get_response_async(self, path, params, timeout=8):
+        try:
+            resp = await async_http.get(
+                f"{self.base_url}{path}",
+                params={"key": self.api_key, **params},
+                timeout=timeout,
+            )
+            return resp.json().get("response", {})
+        except Exception:
+            return {}
+
+    async def _owned_games_async(self, steam_id):
+        try:
+            resp = await async_http.get(
+                f"{self.base_url}{OWNED_GAMES_PATH}",
+                params={
+                    "key": self.api_key,
+                    "steamid": steam_id,
+                    "include_played_free_games": 1,
+                    "format": "json",
+                },
+                timeout=10,
+            )
+            # The Body Arrives Whole, But Games Are Still Summarized One At A Time
+            total_minutes, top_games = summarize_owned_games(
+                iter_json_array([resp.text], "games"), 10
+            )
+        except Exception:
+            return 0, [], {}
+
+        if not top_games:
+            return total_minutes, top_games, {}
+
+        try:
+            params = self._app_names_params(steam_id, [g["appid"] for g in top_games])
+        except Exception:
+            return total_minutes, top_games, {}
+
+        names = await self._get_response_async(OWNED_GAMES_PATH, params)
+        names = {g.get("appid"): g.get("name") for g in names.get("games", [])}
+        return total_minutes, top_games, names
+
+    async def _fetch_roast_data_async(self, steam_id=None, vanity=None):
+        if not steam_id and vanity:
+            data = await self._get_response_async(
+                "/ISteamUser/ResolveVanityURL/v0001/", {"vanityurl": vanity}
+            )
+            steam_id = data.get("steamid") if data.get("success") == 1 else None
+
+        if not steam_id:
+            return {}
+
+        # Summary, Library And Recent Games Don't Depend On Each Other
+        summary, (total_minutes, top_games, names), recent = await asyncio.gather(
+            self._get_response_async(
+                "/ISteamUser/GetPlayerSummaries/v0002/", {"steamids": steam_id}
+            ),
+            self._owned_games_async(steam_id),
+            self._get_response_async(
+                "/IPlayerService/GetRecentlyPlayedGames/v0001/",
+                {"steamid": steam_id, "format": "json"},
+            ),
+        )
+        return self._result(steam_id, summary, total_minutes, top_games, names, recent)
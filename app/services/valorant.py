@@ -1,95 +1,161 @@
+import asyncio
 import os
-import requests
 from collections import Counter
 
+from . import async_http
+from .aggregator import get_subrequest_executor
+from .cache import get_cache
+from .deadline import submit_in_context
+from .http_client import get_session
+
+MATCH_COUNT = 5
+
+
+def index_players(players):
+    return {
+        f"{p.get('name', '').lower()}#{p.get('tag', '').lower()}": p for p in players
+    }
+
+
+def summarize_matches(matches, name, tag):
+    me_key = f"{name.lower()}#{tag.lower()}"
+    total_kills = total_deaths = total_headshots = total_shots = 0
+    kd_list = []
+    agents = []
+    wins = 0
+
+    for match in matches:
+        me = index_players(match.get("players", [])).get(me_key)
+
+        if not me:
+            continue
+
+        k = me["stats"]["kills"]
+        d = me["stats"]["deaths"]
+        h = me["stats"]["headshots"]
+
+        total_kills += k
+        total_deaths += d
+        total_headshots += h
+        total_shots += h + me["stats"]["bodyshots"] + me["stats"]["legshots"]
+
+        agents.append(me["agent"]["name"])
+        kd_list.append(k / d if d else k)
+        my_team = me["team_id"].lower()
+
+        win_team = next(
+            (t["team_id"] for t in match.get("teams", []) if t.get("won")), None
+        )
+
+        if win_team and win_team.lower() == my_team:
+            wins += 1
+
+    avg_kd = round(total_kills / total_deaths, 2) if total_deaths else total_kills
+    headshot_rate = (
+        round((total_headshots / total_shots) * 100, 2) if total_shots else 0
+    )
+
+    main_agent = Counter(agents).most_common(1)[0][0] if agents else "Unknown"
+    recent_perf = f"{wins}W/{len(matches) - wins}L last {len(matches)}"
+
+    return {
+        "k_d_ratio": avg_kd,
+        "main_agent": main_agent,
+        "recent_matches": recent_perf,
+        "headshot_rate": headshot_rate,
+    }
+
+
+def parse_mmr(data):
+    current = (data.get("data") or {}).get("current")
+    if not current:
+        return "Unranked", 0
+    return current["tier"]["name"], current["elo"]
+
 
 class ValorantService:
     def __init__(self, api_key=None):
         self.api_key = api_key or os.getenv("HENRIK_API_KEY")
-        self.base_url = "https://api.henrikdev.xyz/valorant"
+        self.base_url = os.getenv(
+            "VALORANT_API_URL", "https://api.henrikdev.xyz/valorant"
+        )
         self.headers = {"Authorization": f"{self.api_key}"} if self.api_key else {}
+        self.http = get_session()
 
     def get_roast_data(self, name, tag, region="na"):
-        mmr_url = f"{self.base_url}/v3/mmr/{region}/pc/{name}/{tag}"
-        mmr_res = requests.get(mmr_url, headers=self.headers)
-        rank = "Unranked"
-        elo = 0
-
-        if mmr_res.status_code == 200:
-            data = mmr_res.json()
-
-            if data.get("data") and data["data"].get("current"):
-                rank = data["data"]["current"]["tier"]["name"]
-                elo = data["data"]["current"]["elo"]
-        else:
-            return {}
+        return get_cache().get_or_fetch(
+            "valorant",
+            f"{name}#{tag}",
+            lambda: self._fetch_roast_data(name, tag, region),
+            region=region,
+        )
 
-        matches_url = f"{self.base_url}/v4/matches/{region}/pc/{name}/{tag}"
-        matches_res = requests.get(matches_url, headers=self.headers)
-
-        if matches_res.status_code != 200:
-            return {
-                "type": "valorant",
-                "ign": f"{name}#{tag}",
-                "rank": rank,
-                "elo": elo,
-            }
-
-        matches = matches_res.json().get("data", [])[:5]
-        total_kills = total_deaths = total_headshots = total_shots = 0
-        kd_list = []
-        agents = []
-        wins = 0
-
-        for match in matches:
-            me = next(
-                (
-                    p
-                    for p in match.get("players", [])
-                    if p["name"].lower() == name.lower()
-                    and p["tag"].lower() == tag.lower()
-                ),
-                None,
-            )
-
-            if not me:
-                continue
-
-            k = me["stats"]["kills"]
-            d = me["stats"]["deaths"]
-            h = me["stats"]["headshots"]
-
-            total_kills += k
-            total_deaths += d
-            total_headshots += h
-            total_shots += h + me["stats"]["bodyshots"] + me["stats"]["legshots"]
-
-            agents.append(me["agent"]["name"])
-            kd_list.append(k / d if d else k)
-            my_team = me["team_id"].lower()
-
-            win_team = next(
-                (t["team_id"] for t in match.get("teams", []) if t.get("won")), None
-            )
-
-            if win_team and win_team.lower() == my_team:
-                wins += 1
-
-        avg_kd = round(total_kills / total_deaths, 2) if total_deaths else total_kills
-        headshot_rate = (
-            round((total_headshots / total_shots) * 100, 2) if total_shots else 0
+    async def get_roast_data_async(self, name, tag, region="na"):
+        return await get_cache().get_or_fetch_async(
+            "valorant",
+            f"{name}#{tag}",
+            lambda: self._fetch_roast_data_async(name, tag, region),
+            region=region,
         )
 
-        main_agent = Counter(agents).most_common(1)[0][0] if agents else "Unknown"
-        recent_perf = f"{wins}W/{len(matches) - wins}L last {len(matches)}"
+    def _urls(self, name, tag, region):
+        return (
+            f"{self.base_url}/v3/mmr/{region}/pc/{name}/{tag}",
+            f"{self.base_url}/v4/matches/{region}/pc/{name}/{tag}",
+        )
 
-        return {
+    def _build_result(self, name, tag, mmr_res, matches_res):
+        if mmr_res.status_code != 200:
+            return {}
+
+        rank, elo = parse_mmr(mmr_res.json())
+        result = {
             "type": "valorant",
             "ign": f"{name}#{tag}",
             "rank": rank,
             "elo": elo,
-            "k_d_ratio": avg_kd,
-            "main_agent": main_agent,
-            "recent_matches": recent_perf,
-            "headshot_rate": headshot_rate,
         }
+
+        if matches_res is None or matches_res.status_code != 200:
+            return result
+
+        matches = matches_res.json().get("data", [])[:MATCH_COUNT]
+        return {**result, **summarize_matches(matches, name, tag)}
+
+    def _fetch_roast_data(self, name, tag, region="na"):
+        mmr_url, matches_url = self._urls(name, tag, region)
+
+        # Both Requests Are In Flight Together, So The Stage Costs One Round-Trip
+        matches_future = submit_in_context(
+            get_subrequest_executor(),
+            self.http.get,
+            matches_url,
+            headers=self.headers,
+            params={"size": MATCH_COUNT},
+        )
+        mmr_res = self.http.get(mmr_url, headers=self.headers)
+
+        try:
+            matches_res = matches_future.result()
+        except Exception:
+            matches_res = None
+
+        return self._build_result(name, tag, mmr_res, matches_res)
+
+    async def _fetch_roast_data_async(self, name, tag, region="na"):
+        mmr_url, matches_url = self._urls(name, tag, region)
+
+        mmr_res, matches_res = await asyncio.gather(
+            async_http.get(mmr_url, headers=self.headers),
+            async_http.get(
+                matches_url, headers=self.headers, params={"size": MATCH_COUNT}
+            ),
+            return_exceptions=True,
+        )
+
+        if isinstance(mmr_res, BaseException):
+            raise mmr_res
+        if isinstance(matches_res, BaseException):
+            matches_res = None
+
+        return self._build_result(name, tag, mmr_res, matches_res)
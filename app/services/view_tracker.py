@@ -0,0 +1,125 @@
+import atexit
+import threading
+from datetime import datetime
+
+from ..models.database import db, RecentRoast
+
+RECENT_LIMIT = 20
+
+
+class RecentViewBuffer:
+    "Coalesces Roast Views In Memory And Writes Them To recent_roasts In Batches"
+
+    def __init__(self):
+        self.app = None
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = float(app.config.get("RECENT_VIEW_FLUSH_INTERVAL", 5))
+        self.max_pending = int(app.config.get("RECENT_VIEW_FLUSH_SIZE", 500))
+
+        if self.interval > 0:
+            threading.Thread(
+                target=self._work, name="recent-view-flush", daemon=True
+            ).start()
+            atexit.register(self._flush_in_context)
+
+    def record(self, user_id, roast_id):
+        with self.lock:
+            self.pending[(user_id, roast_id)] = datetime.utcnow()
+            full = len(self.pending) >= self.max_pending
+
+        if self.interval <= 0:
+            self.flush()
+        elif full:
+            self.wakeup.set()
+
+    def flush(self):
+        with self.lock:
+            batch, self.pending = self.pending, {}
+
+        if not batch:
+            return
+
+        rows = [
+            {"user_id": user_id, "roast_id": roast_id, "viewed_at": viewed_at}
+            for (user_id, roast_id), viewed_at in batch.items()
+        ]
+        user_ids = {row["user_id"] for row in rows}
+
+        try:
+            self._upsert(rows)
+            self._trim(user_ids)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Recent view flush error: {e}")
+
+    def _upsert(self, rows):
+        dialect = db.engine.dialect.name
+
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            for row in rows:
+                recent = RecentRoast.query.filter_by(
+                    user_id=row["user_id"], roast_id=row["roast_id"]
+                ).first()
+                if recent:
+                    recent.viewed_at = row["viewed_at"]
+                else:
+                    db.session.add(RecentRoast(**row))
+            db.session.flush()
+            return
+
+        stmt = insert(RecentRoast.__table__).values(rows)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "roast_id"],
+                set_={"viewed_at": stmt.excluded.viewed_at},
+            )
+        )
+
+    def _trim(self, user_ids):
+        ranked = (
+            db.select(
+                RecentRoast.id,
+                db.func.row_number()
+                .over(
+                    partition_by=RecentRoast.user_id,
+                    order_by=RecentRoast.viewed_at.desc(),
+                )
+                .label("position"),
+            )
+            .where(RecentRoast.user_id.in_(user_ids))
+            .subquery()
+        )
+        db.session.execute(
+            db.delete(RecentRoast).where(
+                RecentRoast.id.in_(
+                    db.select(ranked.c.id).where(ranked.c.position > RECENT_LIMIT)
+                )
+            )
+        )
+
+    def _flush_in_context(self):
+        with self.app.app_context():
+            self.flush()
+
+    def _work(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+
+            try:
+                self._flush_in_context()
+            except Exception as e:
+                print(f"Recent view flush error: {e}")
+
+
+recent_views = RecentViewBuffer()
@@ -1,5 +1,8 @@
+import math
 from functools import wraps
-from flask import session, redirect, url_for
+from flask import current_app, session, redirect, url_for, request, jsonify
+
+from .rate_limit import get_limiter
 
 
 def login_required(f):
@@ -10,3 +13,40 @@ def login_required(f):
         return f(*args, **kwargs)
 
     return wrapper
+
+
+def check_rate_limit(scope, limit=1, period=300):
+    "None When The Client May Proceed, Otherwise The 429 Response To Send"
+    if not current_app.config.get("RATE_LIMIT_ENABLED", True):
+        return None
+
+    key = f"{scope}:{request.remote_addr}"
+
+    try:
+        allowed, retry_after = get_limiter().take(key, limit, period)
+    except Exception as e:
+        print(f"Rate limiter error: {e}")
+        allowed, retry_after = True, 0
+
+    if allowed:
+        return None
+
+    wait_time = math.ceil(retry_after)
+    response = jsonify(
+        {"error": f"Rate limit exceeded. Please wait {wait_time} seconds."}
+    )
+    response.headers["Retry-After"] = str(wait_time)
+    return response, 429
+
+
+def rate_limit(scope, limit=1, period=300):
+    "Allows `limit` Requests Per `period` Seconds For Each Client In `scope`"
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            return check_rate_limit(scope, limit, period) or f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,66 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+
+
+class ResponseCache:
+    "LRU Of Serialized Response Bodies, Optionally Expiring After `ttl` Seconds"
+
+    def __init__(self, max_size=256, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            body, etag, stored_at = entry
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return body, etag
+
+    def set(self, key, body):
+        etag = hashlib.sha256(body).hexdigest()
+
+        with self.lock:
+            self.entries[key] = (body, etag, time.monotonic())
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+        return body, etag
+
+    def configure(self, max_size=None, ttl=None):
+        with self.lock:
+            if max_size is not None:
+                self.max_size = int(max_size)
+            if ttl is not None:
+                self.ttl = float(ttl)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def serialize(payload):
+    return current_app.json.dumps(payload).encode()
+
+
+def conditional_json(body, etag, max_age):
+    "Builds A JSON Response With A Strong ETag, Answering 304 When It Matches"
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
@@ -0,0 +1,276 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+# Seconds; Upstream Calls Sit Around 0.1-2s, Gemini Up To The Roast Deadline
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+
+# Histograms Not Measured In Seconds Bring Their Own Buckets
+BUCKETS = {
+    "roast_prompt_tokens": (100, 200, 400, 600, 800, 1200, 1600, 2400, 3200, 4800),
+}
+
+# name -> (type, help)
+METRICS = {
+    "roast_stage_seconds": (
+        "histogram",
+        "Time spent in each stage of building a roast",
+    ),
+    "roast_stage_errors_total": (
+        "counter",
+        "Roast stages that raised or fell back",
+    ),
+    "provider_fetch_seconds": (
+        "histogram",
+        "Time each provider took inside the fan-out",
+    ),
+    "provider_errors_total": (
+        "counter",
+        "Provider fetches that failed, timed out, sat queued past their deadline, "
+        "were short-circuited or came back empty",
+    ),
+    "upstream_request_seconds": (
+        "histogram",
+        "Outbound HTTP calls by upstream and status class",
+    ),
+    "upstream_request_errors_total": (
+        "counter",
+        "Outbound HTTP calls that raised before a response arrived",
+    ),
+    "cache_requests_total": (
+        "counter",
+        "Provider cache and roast memo lookups by result",
+    ),
+    "roast_prompt_tokens": (
+        "histogram",
+        "Estimated tokens in each roast's provider data block",
+    ),
+    "roast_prompt_truncations_total": (
+        "counter",
+        "List items dropped from roast prompts to stay within the token budget",
+    ),
+}
+
+
+def label_key(labels):
+    return json.dumps(labels, sort_keys=True)
+
+
+class MemoryMetricStore:
+    "Totals For One Process"
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def add(self, deltas):
+        with self.lock:
+            for key, amount in deltas.items():
+                self.totals[key] += amount
+
+    def totals_snapshot(self):
+        with self.lock:
+            return dict(self.totals)
+
+
+class SQLiteMetricStore:
+    "Totals In A SQLite File Every Worker On The Host Adds Into"
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS metrics ("
+            "name TEXT NOT NULL, labels TEXT NOT NULL, value REAL NOT NULL, "
+            "PRIMARY KEY (name, labels))"
+        )
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def add(self, deltas):
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO metrics (name, labels, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value",
+                [(name, labels, amount) for (name, labels), amount in deltas.items()],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def totals_snapshot(self):
+        rows = self._conn().execute("SELECT name, labels, value FROM metrics")
+        return {(name, labels): value for name, labels, value in rows}
+
+
+class Metrics:
+    "Counters And Histograms Buffered In Process, Flushed Into A Shared Store"
+
+    def __init__(self, store, flush_interval=5, buckets=DEFAULT_BUCKETS):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self.pending = defaultdict(float)
+        self.lock = threading.Lock()
+        self.flusher = None
+
+    def inc(self, name, amount=1, **labels):
+        self._add({(name, label_key(labels)): amount})
+
+    def observe(self, name, value, **labels):
+        # Buckets Are Stored Non-Cumulative And Summed Up At Render Time
+        buckets = BUCKETS.get(name, self.buckets)
+        le = next((b for b in buckets if value <= b), "+Inf")
+        self._add(
+            {
+                (f"{name}_bucket", label_key({**labels, "le": str(le)})): 1,
+                (f"{name}_sum", label_key(labels)): value,
+                (f"{name}_count", label_key(labels)): 1,
+            }
+        )
+
+    @contextmanager
+    def timer(self, name, errors=None, **labels):
+        "Observes The Block's Duration; Counts It In `errors` If It Raises"
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            if errors:
+                self.inc(errors, **labels)
+            raise
+        finally:
+            self.observe(name, time.monotonic() - started, **labels)
+
+    def _add(self, deltas):
+        with self.lock:
+            for key, amount in deltas.items():
+                self.pending[key] += amount
+
+        if self.flush_interval <= 0:
+            self.flush()
+        elif self.flusher is None:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        with self.lock:
+            if self.flusher is not None:
+                return
+            self.flusher = threading.Thread(
+                target=self._flush_loop, name="metrics-flush", daemon=True
+            )
+            self.flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            deltas, self.pending = self.pending, defaultdict(float)
+
+        if not deltas:
+            return
+
+        try:
+            self.store.add(deltas)
+        except Exception as e:
+            print(f"Metrics flush error: {e}")
+            # Put Them Back So The Next Flush Retries
+            with self.lock:
+                for key, amount in deltas.items():
+                    self.pending[key] += amount
+
+    def render(self):
+        "All Workers' Totals In Prometheus Text Exposition Format"
+        self.flush()
+
+        series = defaultdict(dict)
+        for (name, labels), value in self.store.totals_snapshot().items():
+            series[name][labels] = value
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            if kind == "counter":
+                for labels, value in sorted(series[name].items()):
+                    lines.append(_sample(name, json.loads(labels), value))
+                continue
+
+            buckets = defaultdict(dict)
+            for labels, value in series[f"{name}_bucket"].items():
+                labels = json.loads(labels)
+                le = labels.pop("le")
+                buckets[label_key(labels)][le] = value
+
+            for labels, count in sorted(series[f"{name}_count"].items()):
+                running = 0
+                for le in [*map(str, BUCKETS.get(name, self.buckets)), "+Inf"]:
+                    running += buckets[labels].get(le, 0)
+                    lines.append(
+                        _sample(f"{name}_bucket", {**json.loads(labels), "le": le}, running)
+                    )
+
+                total = series[f"{name}_sum"].get(labels, 0)
+                lines.append(_sample(f"{name}_sum", json.loads(labels), total))
+                lines.append(_sample(f"{name}_count", json.loads(labels), count))
+
+        return "\n".join(lines) + "\n"
+
+
+def _sample(name, labels, value):
+    if labels:
+        pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+        name = f"{name}{{{pairs}}}"
+    return f"{name} {_format_value(value)}"
+
+
+def _format_value(value):
+    # Full Precision: Rounded Counters Would Break rate() And increase()
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def get_metrics():
+    global _metrics
+
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                if os.getenv("METRICS_BACKEND", "sqlite").lower() == "memory":
+                    store = MemoryMetricStore()
+                else:
+                    store = SQLiteMetricStore(os.getenv("METRICS_PATH", "metrics.db"))
+
+                _metrics = Metrics(
+                    store, float(os.getenv("METRICS_FLUSH_INTERVAL", 5))
+                )
+    return _metrics
@@ -0,0 +1,45 @@
+import click
+from flask.cli import with_appcontext
+
+from ..models.database import db, Roast, RoastPayload
+
+
+def backfill_roast_payloads(batch_size=500):
+    "Moves Legacy Inline raw_data Into roast_payloads, One Committed Batch At A Time"
+    moved = cleared = 0
+    last_id = ""
+
+    while True:
+        roasts = (
+            Roast.query.options(db.undefer(Roast.raw_data), db.selectinload(Roast.payload))
+            .filter(Roast.raw_data.isnot(None), Roast.id > last_id)
+            .order_by(Roast.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not roasts:
+            return moved, cleared
+
+        for roast in roasts:
+            if roast.payload is None and roast.raw_data:
+                roast.payload = RoastPayload.pack(roast.raw_data)
+                moved += 1
+            else:
+                cleared += 1
+
+            # db.null(), Not None: The JSON Type Would Store A JSON 'null' Instead
+            roast.raw_data = db.null()
+
+        last_id = roasts[-1].id
+        db.session.commit()
+        db.session.expunge_all()
+        print(f"Backfilled through roast {last_id}: {moved} packed, {cleared} cleared")
+
+
+@click.command("backfill-payloads")
+@click.option("--batch-size", default=500, show_default=True)
+@with_appcontext
+def backfill_payloads_command(batch_size):
+    "Packs Legacy roasts.raw_data Into roast_payloads And Nulls The Inline Copy"
+    moved, cleared = backfill_roast_payloads(batch_size)
+    click.echo(f"Done: {moved} payloads packed, {cleared} stale raw_data cleared.")
@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+class MemoryBucketStore:
+    "Token Buckets For One Process, Capped At max_keys"
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        now = time.time()
+        rate = capacity / period
+
+        with self.lock:
+            tokens, updated_at = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            self.buckets[key] = (tokens, now)
+            self._evict(now, period)
+
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def _evict(self, now, period):
+        # Oldest First, So Stop At The First Bucket That Has Not Refilled Yet
+        while self.buckets:
+            key, (_, updated_at) = next(iter(self.buckets.items()))
+            if len(self.buckets) <= self.max_keys and now - updated_at < period:
+                break
+            del self.buckets[key]
+
+
+class SQLiteBucketStore:
+    "Token Buckets In A SQLite File Shared By All Workers On The Host"
+
+    def __init__(self, path, max_keys=10000):
+        self.path = path
+        self.max_keys = max_keys
+        self.local = threading.local()
+        self.writes = 0
+
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn().execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limits_updated ON rate_limits (updated_at)"
+        )
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def take(self, key, capacity, period):
+        now = time.time()
+        rate = capacity / period
+        conn = self._conn()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+
+            tokens = capacity if row is None else min(
+                capacity, row[0] + (now - row[1]) * rate
+            )
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+
+            self.writes += 1
+            if self.writes % 100 == 0:
+                self._evict(conn, now, period)
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def _evict(self, conn, now, period):
+        conn.execute("DELETE FROM rate_limits WHERE updated_at < ?", (now - period,))
+        conn.execute(
+            "DELETE FROM rate_limits WHERE key IN ("
+            "SELECT key FROM rate_limits ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_keys,),
+        )
+
+
+def get_limiter():
+    global _limiter
+
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                max_keys = int(os.getenv("RATE_LIMIT_MAX_KEYS", 10000))
+
+                if os.getenv("RATE_LIMIT_BACKEND", "sqlite").lower() == "memory":
+                    _limiter = MemoryBucketStore(max_keys)
+                else:
+                    _limiter = SQLiteBucketStore(
+                        os.getenv("RATE_LIMIT_PATH", "rate_limit.db"), max_keys
+                    )
+    return _limiter
@@ -0,0 +1,90 @@
+import hashlib
+import importlib
+import sys
+import time
+
+PROCESS_STARTED = time.perf_counter()
+
+import_timings = {}
+
+
+def lazy_import(module_name):
+    "Imports A Heavy SDK On First Use And Records How Long It Took"
+    if module_name in sys.modules:
+        # Not sys.modules[...] Directly: import_module Waits Out Another
+        # Thread's Import That Is Still Running Instead Of Returning It Half-Built
+        return importlib.import_module(module_name)
+
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_timings[module_name] = round((time.perf_counter() - started) * 1000, 1)
+    return module
+
+
+class StartupTimer:
+    def __init__(self):
+        self.phases = {}
+        self.last = time.perf_counter()
+        self.first_response_ms = None
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self.last) * 1000, 1)
+        self.last = now
+
+    def mark_first_response(self):
+        if self.first_response_ms is None:
+            self.first_response_ms = round(
+                (time.perf_counter() - PROCESS_STARTED) * 1000, 1
+            )
+
+    def to_dict(self):
+        return {
+            "phases_ms": self.phases,
+            "total_ms": round(sum(self.phases.values()), 1),
+            "lazy_imports_ms": import_timings,
+            "first_response_ms": self.first_response_ms,
+        }
+
+
+def schema_version(metadata):
+    "Fingerprint Of Every Table, Column And Index The Models Declare"
+    parts = []
+    for table in metadata.sorted_tables:
+        parts.append(table.name)
+        parts.extend(f"{table.name}.{c.name}:{c.type}" for c in table.columns)
+        parts.extend(f"{table.name}#{i.name}" for i in table.indexes)
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def ensure_schema(db):
+    "Runs create_all Only When The Stored Schema Marker Is Missing Or Stale"
+    version = schema_version(db.metadata)
+
+    try:
+        with db.engine.connect() as conn:
+            current = conn.execute(
+                db.text("SELECT version FROM schema_version")
+            ).scalar()
+        if current == version:
+            return False
+    except Exception:
+        pass
+
+    db.create_all()
+
+    # create_all Skips Existing Tables, So Add Indexes Introduced Later
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+    with db.engine.begin() as conn:
+        conn.execute(
+            db.text("CREATE TABLE IF NOT EXISTS schema_version (version VARCHAR(32))")
+        )
+        conn.execute(db.text("DELETE FROM schema_version"))
+        conn.execute(
+            db.text("INSERT INTO schema_version (version) VALUES (:version)"),
+            {"version": version},
+        )
+    return True
@@ -0,0 +1,249 @@
+"""
+Times The Read Endpoints' Queries Against A Seeded Database (See bench.seed_db)
+
+    python -m bench.db_queries --database-url sqlite:////tmp/roast-scale.db
+    python -m bench.db_queries --database-url postgresql://localhost/roast_bench --explain
+    python -m bench.db_queries --database-url ... --save baseline.json
+    python -m bench.db_queries --database-url ... --compare baseline.json
+
+--compare Exits Non-Zero When Any Endpoint's p95 Grows Past --tolerance.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+from .roast_load import percentile
+
+
+class QueryRecorder:
+    "Collects Every Statement (And Its Time) Issued While Active"
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.statements = []
+        self.active = False
+        event.listen(engine, "before_cursor_execute", self.before)
+        event.listen(engine, "after_cursor_execute", self.after)
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("bench_started", []).append(time.perf_counter())
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["bench_started"].pop()
+        if self.active:
+            self.statements.append((statement, parameters, elapsed))
+
+    def start(self):
+        self.statements = []
+        self.active = True
+
+    def stop(self):
+        self.active = False
+        return self.statements
+
+
+def endpoint_cases(client, sample, rng, feed_depth):
+    "(name, path, session values) For One Iteration Of Every Read Endpoint"
+    cases = [
+        ("get_roast", f"/api/roast/{rng.choice(sample['roast_ids'])}", {}),
+        ("get_public_roasts", "/api/roast/public?limit=20", {}),
+        ("get_history", "/api/roast/history", {"user_id": rng.choice(sample["user_ids"])}),
+        (
+            "get_my_roasts",
+            "/api/roast/mine",
+            {"my_roast_ids": rng.sample(sample["roast_ids"], 10)},
+        ),
+    ]
+
+    # Walk A Few Pages Down The Feed Once, Then Time The Deep Page Itself
+    path = "/api/roast/public?limit=20"
+    for _ in range(feed_depth):
+        cursor = client.get(path).get_json().get("next_cursor")
+        if not cursor:
+            break
+        path = f"/api/roast/public?limit=20&before={cursor}"
+    cases.append(("get_public_roasts_deep", path, {}))
+
+    return cases
+
+
+def sample_ids(db, Roast, User, size, rng):
+    roast_ids = [r for (r,) in db.session.query(Roast.id).limit(size * 20)]
+    user_ids = [u for (u,) in db.session.query(User.id).limit(size * 20)]
+    return {
+        "roast_ids": rng.sample(roast_ids, min(size, len(roast_ids))),
+        "user_ids": rng.sample(user_ids, min(size, len(user_ids))) or [None],
+    }
+
+
+def explain(db, statement, parameters):
+    dialect = db.engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    return [" ".join(str(c) for c in row) for row in rows]
+
+
+def run(args):
+    # Imported After DATABASE_URL Is Set, Since Config Reads It At Import Time
+    from app import create_app
+    from app.models.database import Roast, User, db
+    from app.routes import api_routes
+
+    app = create_app()
+    app.config.update(TESTING=True)
+    rng = random.Random(args.seed)
+    client = app.test_client()
+
+    with app.app_context():
+        recorder = QueryRecorder(db.engine)
+        sample = sample_ids(db, Roast, User, args.sample, rng)
+        dialect = db.engine.dialect.name
+        counts = {
+            "users": db.session.query(User).count(),
+            "roasts": db.session.query(Roast).count(),
+        }
+        db.session.remove()
+
+    wall = defaultdict(list)
+    sql = defaultdict(list)
+    statements = defaultdict(list)
+    plans = {}
+
+    for iteration in range(args.warmup + args.iterations):
+        for name, path, values in endpoint_cases(client, sample, rng, args.feed_depth):
+            # Measure The Database, Not The Response Caches In Front Of It
+            api_routes.roast_responses.clear()
+            api_routes.feed_responses.clear()
+
+            with client.session_transaction() as session:
+                session.clear()
+                session.update(values)
+
+            recorder.start()
+            started = time.perf_counter()
+            response = client.get(path)
+            elapsed = time.perf_counter() - started
+            issued = recorder.stop()
+
+            if response.status_code != 200:
+                print(f"{name}: {path} -> {response.status_code}", file=sys.stderr)
+
+            if iteration < args.warmup:
+                continue
+
+            wall[name].append(elapsed * 1000)
+            sql[name].append(sum(t for _, _, t in issued) * 1000)
+            statements[name].append(len(issued))
+
+            if args.explain and name not in plans:
+                with app.app_context():
+                    plans[name] = [
+                        {"sql": statement, "plan": explain(db, statement, parameters)}
+                        for statement, parameters, _ in issued
+                        if statement.lstrip().upper().startswith("SELECT")
+                    ]
+
+    report = {
+        "dialect": dialect,
+        "rows": counts,
+        "endpoints": {
+            name: {
+                "p50_ms": round(percentile(wall[name], 50), 2),
+                "p95_ms": round(percentile(wall[name], 95), 2),
+                "max_ms": round(max(wall[name]), 2),
+                "sql_p95_ms": round(percentile(sql[name], 95), 2),
+                "statements": max(statements[name]),
+            }
+            for name in wall
+        },
+    }
+    if plans:
+        report["plans"] = plans
+    return report
+
+
+def compare(report, baseline, tolerance):
+    "Endpoints Whose p95 Grew Past tolerance x The Baseline (Or Issue More Queries)"
+    regressions = []
+
+    for name, now in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+
+        if now["p95_ms"] > before["p95_ms"] * tolerance:
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+        if now["statements"] > before["statements"]:
+            regressions.append(
+                f"{name}: {before['statements']} -> {now['statements']} statements"
+            )
+
+    return regressions
+
+
+def print_report(report):
+    print(f"\n{report['dialect']}: {report['rows']}\n")
+    print(f"{'endpoint':<26}{'p50':>9}{'p95':>9}{'max':>9}{'sql p95':>10}{'stmts':>7}")
+    for name, row in report["endpoints"].items():
+        print(
+            f"{name:<26}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['max_ms']:>9}"
+            f"{row['sql_p95_ms']:>10}{row['statements']:>7}"
+        )
+
+    for name, plans in report.get("plans", {}).items():
+        print(f"\n== {name}")
+        for entry in plans:
+            print(entry["sql"].strip())
+            for line in entry["plan"]:
+                print(f"   {line}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--sample", type=int, default=500, help="Ids to draw from")
+    parser.add_argument("--feed-depth", type=int, default=25, help="Pages to walk")
+    parser.add_argument("--explain", action="store_true")
+    parser.add_argument("--save", help="Write the report as JSON")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier --save")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    os.environ.update(
+        DATABASE_URL=args.database_url,
+        ROAST_JOB_WORKERS="0",
+        # Views Recorded By get_roast Should Not Land Mid-Measurement
+        RECENT_VIEW_FLUSH_INTERVAL="3600",
+        RATE_LIMIT_ENABLED="false",
+    )
+
+    report = run(args)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
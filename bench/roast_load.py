@@ -0,0 +1,342 @@
+"""
+Drives POST /api/roast Against Local Upstream Stubs And Reports Throughput
+
+    python -m bench.roast_load --requests 200 --concurrency 16
+    python -m bench.roast_load --server gunicorn --workers 4 --worker-class gthread --threads 8
+    python -m bench.roast_load --server uvicorn --workers 4 --concurrency 64
+    python -m bench.roast_load --latency steam=300 --error-rate valorant=0.1 --size steam=20000
+
+Per-stage numbers come from the Server-Timing header /api/roast sets.
+"""
+
+import argparse
+import atexit
+import itertools
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .stubs import ROUTES, StubSettings, start_stubs, stub_env
+
+SECRET_KEY = "bench-secret-key"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def parse_server_timing(header):
+    timings = {}
+    for part in (header or "").split(","):
+        name, _, dur = part.strip().partition(";dur=")
+        if name and dur:
+            timings[name] = float(dur)
+    return timings
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spotify_cookie():
+    "A Signed Session Cookie Carrying A Spotify Token, So The Spotify Stub Gets Hit"
+    from flask import Flask
+    from flask.sessions import SecureCookieSessionInterface
+
+    signer = Flask("bench")
+    signer.secret_key = SECRET_KEY
+    serializer = SecureCookieSessionInterface().get_signing_serializer(signer)
+    return serializer.dumps(
+        {
+            "spotify_token_info": {
+                "access_token": "bench",
+                "expires_at": int(time.time()) + 86400,
+            },
+            "user_name": "bench",
+        }
+    )
+
+
+def app_env(args, stubs, workdir):
+    env = {
+        **stub_env(stubs),
+        "SECRET_KEY": SECRET_KEY,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "RATE_LIMIT_ENABLED": "false",
+        "RATE_LIMIT_PATH": os.path.join(workdir, "rate_limit.db"),
+        "METRICS_PATH": os.path.join(workdir, "metrics.db"),
+        "PROVIDER_CACHE_PATH": os.path.join(workdir, "provider_cache.db"),
+        "ROAST_JOB_WORKERS": "0",
+        "SESSION_COOKIE_SECURE": "false",
+    }
+
+    if not args.cache:
+        # Every Request Should Reach The Stubs Unless Caching Is What's Measured
+        env["ROAST_CACHE_VARIANTS"] = "0"
+        for provider in ("anime", "steam", "valorant"):
+            env[f"PROVIDER_CACHE_TTL_{provider.upper()}"] = "0"
+
+    return env
+
+
+def start_inprocess(port):
+    # Imported Here So app.config Sees The Stub Environment
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    from app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server(
+        "127.0.0.1", port, create_app(), threaded=True, request_handler=QuietHandler
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+def start_gunicorn(args, port, env):
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "run:app",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--workers",
+        str(args.workers),
+        "--worker-class",
+        args.worker_class,
+        "--threads",
+        str(args.threads),
+        "--log-level",
+        "warning",
+    ]
+    return start_process(command, env)
+
+
+def start_uvicorn(args, port, env):
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "asgi:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(args.workers),
+        "--log-level",
+        "warning",
+    ]
+    return start_process(command, env)
+
+
+def start_process(command, env):
+    process = subprocess.Popen(command, env={**os.environ, **env})
+
+    def stop():
+        process.terminate()
+        process.wait(timeout=10)
+
+    return stop
+
+
+def wait_until_up(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/api/ping", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"App did not come up at {base_url}")
+
+
+def roast_inputs(n, providers):
+    inputs = {}
+    if "valorant" in providers:
+        inputs.update(valorant_name=f"bench{n}", valorant_tag="0001")
+    if "anime" in providers:
+        inputs["anilist_user"] = f"bench{n}"
+    if "steam" in providers:
+        inputs["steam_id"] = str(76561197960000000 + n)
+    return inputs
+
+
+def run_load(base_url, args):
+    counter = itertools.count()
+    results = []
+    lock = threading.Lock()
+    cookie = spotify_cookie() if "spotify" in args.providers else None
+    stop_at = time.monotonic() + args.duration if args.duration else None
+
+    def worker():
+        http = requests.Session()
+        if cookie:
+            http.cookies.set("session", cookie)
+
+        while True:
+            n = next(counter)
+            if stop_at is None and n >= args.requests:
+                return
+            if stop_at is not None and time.monotonic() >= stop_at:
+                return
+
+            started = time.monotonic()
+            try:
+                response = http.post(
+                    f"{base_url}/api/roast",
+                    json=roast_inputs(n, args.providers),
+                    timeout=60,
+                )
+                status = response.status_code
+                timings = parse_server_timing(response.headers.get("Server-Timing"))
+            except requests.RequestException:
+                status, timings = None, {}
+
+            with lock:
+                results.append((status, time.monotonic() - started, timings))
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(worker)
+    return results, time.monotonic() - started
+
+
+def summarize(results, elapsed):
+    ok = [r for r in results if r[0] == 200]
+    stages = defaultdict(list)
+    for _, _, timings in ok:
+        for name, ms in timings.items():
+            stages[name].append(ms)
+
+    def row(values):
+        return {p: round(percentile(values, p), 1) for p in (50, 95, 99)}
+
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "seconds": round(elapsed, 2),
+        "rps": round(len(ok) / elapsed, 2) if elapsed else 0,
+        "latency_ms": row([latency * 1000 for _, latency, _ in ok]),
+        "stages_ms": {name: row(values) for name, values in sorted(stages.items())},
+    }
+
+
+def print_report(report):
+    print(
+        f"\n{report['requests']} requests, {report['errors']} errors "
+        f"in {report['seconds']}s -> {report['rps']} req/s\n"
+    )
+    print(f"{'stage':<22}{'p50':>10}{'p95':>10}{'p99':>10}")
+    rows = {"total": report["latency_ms"], **report["stages_ms"]}
+    for name, row in rows.items():
+        print(f"{name:<22}{row[50]:>10}{row[95]:>10}{row[99]:>10}")
+
+
+def parse_overrides(values, cast):
+    "['steam=300', '100'] -> {'steam': 300.0, '*': 100.0}"
+    overrides = {}
+    for value in values or []:
+        name, _, amount = value.rpartition("=")
+        overrides[name or "*"] = cast(amount)
+    return overrides
+
+
+def stub_settings(args):
+    latency = parse_overrides(args.latency, float)
+    errors = parse_overrides(args.error_rate, float)
+    sizes = parse_overrides(args.size, int)
+    defaults = StubSettings()
+
+    return {
+        name: StubSettings(
+            latency=latency.get(name, latency.get("*", defaults.latency)),
+            jitter=args.jitter,
+            error_rate=errors.get(name, errors.get("*", defaults.error_rate)),
+            size=sizes.get(name, sizes.get("*", defaults.size)),
+        )
+        for name in ROUTES
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--server", choices=("inprocess", "gunicorn", "uvicorn"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--worker-class", default="gthread")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--duration", type=float, help="Seconds; overrides --requests")
+    parser.add_argument(
+        "--providers",
+        default="spotify,valorant,anime,steam",
+        type=lambda s: set(s.split(",")),
+    )
+    parser.add_argument("--latency", action="append", help="ms, e.g. steam=300 or 80")
+    parser.add_argument("--jitter", type=float, default=10, help="ms either side")
+    parser.add_argument("--error-rate", action="append", help="0-1, e.g. anime=0.05")
+    parser.add_argument("--size", action="append", help="Items per payload, e.g. steam=5000")
+    parser.add_argument("--cache", action="store_true", help="Keep provider/roast caches on")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    stubs = start_stubs(stub_settings(args))
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    # Removed At Exit, After The App's Own atexit Flushes Have Run
+    workdir = tempfile.mkdtemp(prefix="roast-bench-")
+    atexit.register(shutil.rmtree, workdir, True)
+    env = app_env(args, stubs, workdir)
+
+    if args.server == "gunicorn":
+        stop = start_gunicorn(args, port, env)
+    elif args.server == "uvicorn":
+        stop = start_uvicorn(args, port, env)
+    else:
+        os.environ.update(env)
+        stop = start_inprocess(port)
+
+    try:
+        wait_until_up(base_url)
+        results, elapsed = run_load(base_url, args)
+    finally:
+        stop()
+        for stub in stubs.values():
+            stub.stop()
+
+    report = summarize(results, elapsed)
+    report["upstream_requests"] = {name: stub.requests for name, stub in stubs.items()}
+    report["upstream_errors"] = {name: stub.errors for name, stub in stubs.items()}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Seeds users, roasts, roast_payloads And recent_roasts With A Synthetic Corpus
+
+    python -m bench.seed_db --database-url sqlite:////tmp/roast-scale.db --roasts 2000000
+    python -m bench.seed_db --database-url postgresql://localhost/roast_bench --users 200000
+    python -m bench.seed_db --database-url sqlite:////tmp/roast-scale.db --roasts 50000 --reset
+
+Roasts Mix Legacy Inline raw_data Blobs With Compressed roast_payloads Rows,
+Like A Production Table That Predates The Payload Split.
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+ARTISTS = ("Mitski", "Radiohead", "Drake", "Taylor Swift", "Deftones", "Bladee", "ABBA")
+GENRES = ("indie pop", "art rock", "rap", "pop", "nu metal", "cloud rap", "europop")
+AGENTS = ("Jett", "Sage", "Omen", "Reyna", "Killjoy", "Sova")
+RANKS = ("Iron 2", "Bronze 1", "Silver 3", "Gold 2", "Platinum 1", "Diamond 3")
+TITLES = ("Frieren", "Berserk", "One Piece", "Bocchi the Rock!", "Monster", "Mob Psycho 100")
+GAMES = ("Dota 2", "Stardew Valley", "Elden Ring", "Terraria", "Hades", "Factorio")
+
+ID_MULTIPLIER = 2654435761  # Odd, So i -> id Is A Bijection Over 32 Bits
+
+
+def roast_id(i):
+    return f"{(i * ID_MULTIPLIER) % 2**32:08x}"
+
+
+def provider_payload(rng):
+    "Shaped Like CombinedUserData.as_dict(), Around 3-6 KB Of JSON"
+    n = rng.randint(5, 10)
+    return {
+        "spotify": {
+            "top_artists": [
+                f"{rng.choice(ARTISTS)} ({rng.choice(GENRES)}, {rng.choice(GENRES)})"
+                for _ in range(n)
+            ],
+            "recent_tracks": [
+                f"Track {rng.randint(1, 9999)} by {rng.choice(ARTISTS)}" for _ in range(10)
+            ],
+        },
+        "valorant": {
+            "type": "valorant",
+            "ign": f"player{rng.randint(1, 10**6)}#{rng.randint(1000, 9999)}",
+            "rank": rng.choice(RANKS),
+            "elo": rng.randint(0, 2500),
+            "k_d_ratio": round(rng.uniform(0.4, 2.1), 2),
+            "main_agent": rng.choice(AGENTS),
+            "recent_matches": f"{rng.randint(0, 5)}W/{rng.randint(0, 5)}L last 5",
+            "headshot_rate": round(rng.uniform(5, 35), 2),
+        },
+        "anime": {
+            "type": "anime",
+            "username": f"weeb{rng.randint(1, 10**6)}",
+            "days_wasted": round(rng.uniform(1, 400), 1),
+            "total_episodes": rng.randint(10, 20000),
+            "anime_watching_list": [rng.choice(TITLES) for _ in range(n)],
+            "anime_completed_list": [rng.choice(TITLES) for _ in range(10)],
+            "top_anime_genres": list(rng.sample(GENRES, 5)),
+            "favorite_anime": [rng.choice(TITLES) for _ in range(n)],
+            "manga_reading_list": [rng.choice(TITLES) for _ in range(n)],
+            "manga_completed_list": [rng.choice(TITLES) for _ in range(10)],
+            "favorite_manga": [rng.choice(TITLES) for _ in range(n)],
+            "profile_url": "https://anilist.co/user/bench",
+        },
+        "steam": {
+            "type": "steam",
+            "player_name": f"gamer{rng.randint(1, 10**6)}",
+            "total_playtime_hours": round(rng.uniform(10, 20000), 1),
+            "top_games": [
+                f"{rng.choice(GAMES)} ({round(rng.uniform(1, 3000), 1)}h)"
+                for _ in range(10)
+            ],
+            "recent_games": [
+                f"{rng.choice(GAMES)} ({round(rng.uniform(0, 40), 1)}h last 2w)"
+                for _ in range(n)
+            ],
+        },
+    }
+
+
+def roast_text(rng):
+    words = ("your", "taste", "is", "a", "cry", "for", "help", "honestly", "bestie")
+    return " ".join(rng.choice(words) for _ in range(rng.randint(90, 180)))
+
+
+def seed(args):
+    # Imported After DATABASE_URL Is Set, Since Config Reads It At Import Time
+    from app import create_app
+    from app.models.database import (
+        RecentRoast,
+        Roast,
+        RoastCompletion,
+        RoastJob,
+        RoastPayload,
+        User,
+        db,
+    )
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    span = timedelta(days=args.days).total_seconds()
+
+    def insert(model, rows):
+        if rows:
+            db.session.execute(db.insert(model), rows)
+            db.session.commit()
+
+    with app.app_context():
+        # Children First, So Foreign Keys Never Point At A Deleted Row
+        tables = (RecentRoast, RoastPayload, RoastCompletion, RoastJob, Roast, User)
+        if args.reset:
+            for model in tables:
+                db.session.execute(db.delete(model))
+            db.session.commit()
+            print("reset: cleared " + ", ".join(m.__tablename__ for m in tables))
+        elif db.session.scalar(db.select(User.id).limit(1)) is not None or (
+            db.session.scalar(db.select(Roast.id).limit(1)) is not None
+        ):
+            raise SystemExit(
+                "Database already holds users or roasts; seeded ids would collide. "
+                "Re-run with --reset to clear the bench tables first."
+            )
+
+        started = time.monotonic()
+
+        for start in range(0, args.users, args.batch):
+            insert(
+                User,
+                [
+                    {
+                        "id": i + 1,
+                        "google_id": f"bench-{i}",
+                        "email": f"bench{i}@example.com",
+                        "name": f"Bench User {i}",
+                        "picture": f"https://example.com/avatars/{i}.png",
+                        "created_at": now - timedelta(seconds=rng.uniform(0, span)),
+                    }
+                    for i in range(start, min(start + args.batch, args.users))
+                ],
+            )
+        print(f"users: {args.users} in {time.monotonic() - started:.1f}s")
+
+        started = time.monotonic()
+        for start in range(0, args.roasts, args.batch):
+            roasts, payloads = [], []
+
+            for i in range(start, min(start + args.batch, args.roasts)):
+                combined = provider_payload(rng)
+                sources = [k for k, v in combined.items() if v]
+                inputs = {"anilist_user": combined["anime"]["username"]}
+                legacy = rng.random() < args.legacy_fraction
+
+                roast = {
+                    "id": roast_id(i),
+                    "user_id": (
+                        rng.randint(1, args.users)
+                        if args.users and rng.random() < 0.7
+                        else None
+                    ),
+                    "roast_text": roast_text(rng),
+                    "sources": sources,
+                    "inputs": inputs,
+                    "raw_data": None,
+                    "created_at": now - timedelta(seconds=rng.uniform(0, span)),
+                    "is_public": rng.random() < args.public_fraction,
+                }
+
+                if legacy:
+                    roast["raw_data"] = {**combined, "inputs": inputs, "sources": sources}
+                else:
+                    payloads.append(
+                        {"roast_id": roast["id"], "data": RoastPayload.pack(combined).data}
+                    )
+                roasts.append(roast)
+
+            insert(Roast, roasts)
+            insert(RoastPayload, payloads)
+
+            if (start // args.batch) % 20 == 0:
+                print(f"roasts: {start + len(roasts)}/{args.roasts}")
+        print(f"roasts: {args.roasts} in {time.monotonic() - started:.1f}s")
+
+        started = time.monotonic()
+        views = 0
+        rows = []
+        for user_id in range(1, args.users + 1):
+            seen = {roast_id(rng.randrange(args.roasts)) for _ in range(args.views_per_user)}
+            for viewed in seen:
+                rows.append(
+                    {
+                        "user_id": user_id,
+                        "roast_id": viewed,
+                        "viewed_at": now - timedelta(seconds=rng.uniform(0, span)),
+                    }
+                )
+
+            if len(rows) >= args.batch:
+                insert(RecentRoast, rows)
+                views += len(rows)
+                rows = []
+
+        insert(RecentRoast, rows)
+        views += len(rows)
+        print(f"recent_roasts: {views} in {time.monotonic() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--roasts", type=int, default=1_000_000)
+    parser.add_argument("--views-per-user", type=int, default=20)
+    parser.add_argument("--legacy-fraction", type=float, default=0.5)
+    parser.add_argument("--public-fraction", type=float, default=0.9)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete existing users, roasts and their dependent rows before seeding",
+    )
+    args = parser.parse_args(argv)
+
+    os.environ.update(
+        DATABASE_URL=args.database_url,
+        ROAST_JOB_WORKERS="0",
+        RECENT_VIEW_FLUSH_INTERVAL="0",
+    )
+    seed(args)
+
+
+if __name__ == "__main__":
+    main()
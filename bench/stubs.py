@@ -0,0 +1,288 @@
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Aliases Like u0_animeWatching, Read Back Out Of The Batched Query
+LIST_ALIAS = re.compile(r"\b(u\d+)_(\w+): Page\(")
+
+
+@dataclass
+class StubSettings:
+    "Latency (ms), Error Rate (0-1) And Payload Size For One Upstream"
+
+    latency: float = 50
+    jitter: float = 10
+    error_rate: float = 0.0
+    size: int = 50
+
+
+def title(i):
+    return {"romaji": f"Title {i}", "english": f"Title {i}" if i % 3 else None}
+
+
+def valorant_routes(method, path, query, body, settings):
+    parts = path.strip("/").split("/")
+
+    if "mmr" in parts:
+        return 200, {"data": {"current": {"tier": {"name": "Gold 2"}, "elo": 1234}}}
+
+    if "matches" in parts:
+        name, tag = parts[-2], parts[-1]
+        count = min(settings.size, int(query.get("size", [settings.size])[0]))
+        return 200, {"data": [valorant_match(i, name, tag) for i in range(count)]}
+
+    return 404, {"errors": [{"message": "Not found"}]}
+
+
+def valorant_match(i, name, tag):
+    players = [
+        {
+            "name": name if p == 0 else f"player{p}",
+            "tag": tag if p == 0 else "0000",
+            "team_id": "Red" if p < 5 else "Blue",
+            "agent": {"name": ("Jett", "Sage", "Omen", "Reyna")[(i + p) % 4]},
+            "stats": {
+                "kills": 10 + (i + p) % 15,
+                "deaths": 8 + (i * p) % 12,
+                "headshots": 5 + p,
+                "bodyshots": 20 + i,
+                "legshots": 3,
+            },
+        }
+        for p in range(10)
+    ]
+    teams = [{"team_id": "Red", "won": i % 2 == 0}, {"team_id": "Blue", "won": i % 2}]
+    return {"players": players, "teams": teams}
+
+
+def anilist_routes(method, path, query, body, settings):
+    variables = (body or {}).get("variables", {})
+    per_page = min(settings.size, int(variables.get("perPage") or settings.size))
+    data = {}
+
+    i = 0
+    while f"name{i}" in variables:
+        data[f"u{i}"] = anilist_user(variables[f"name{i}"])
+        i += 1
+
+    for prefix, alias in LIST_ALIAS.findall((body or {}).get("query", "")):
+        data[f"{prefix}_{alias}"] = {
+            "mediaList": [{"media": {"title": title(n)}} for n in range(per_page)]
+        }
+
+    return 200, {"data": data}
+
+
+def anilist_user(name):
+    def stats():
+        return {
+            "count": 120,
+            "minutesWatched": 90000,
+            "episodesWatched": 3600,
+            "chaptersRead": 2400,
+            "volumesRead": 240,
+            "statuses": [
+                {"status": "CURRENT", "count": 6},
+                {"status": "COMPLETED", "count": 100},
+            ],
+            "genres": [{"genre": g, "count": 40} for g in ("Action", "Drama", "Comedy")],
+        }
+
+    favourites = {"nodes": [{"title": title(n)} for n in range(10)]}
+    return {
+        "name": name,
+        "siteUrl": f"https://anilist.co/user/{name}",
+        "statistics": {"anime": stats(), "manga": stats()},
+        "favourites": {"anime": favourites, "manga": favourites},
+    }
+
+
+def steam_routes(method, path, query, body, settings):
+    steam_id = query.get("steamid", query.get("steamids", ["76561197960287930"]))[0]
+
+    if path.endswith("/ResolveVanityURL/v0001/"):
+        return 200, {"response": {"success": 1, "steamid": "76561197960287930"}}
+
+    if path.endswith("/GetPlayerSummaries/v0002/"):
+        return 200, {
+            "response": {
+                "players": [
+                    {
+                        "steamid": steam_id,
+                        "personaname": f"stub{steam_id[-4:]}",
+                        "profileurl": f"https://steamcommunity.com/profiles/{steam_id}",
+                    }
+                ]
+            }
+        }
+
+    if path.endswith("/GetOwnedGames/v0001/"):
+        if "input_json" in query:
+            appids = json.loads(query["input_json"][0]).get("appids_filter", [])
+            games = [{"appid": a, "name": f"Game {a}"} for a in appids]
+            return 200, {"response": {"game_count": len(games), "games": games}}
+
+        games = [
+            {"appid": 1000 + n, "playtime_forever": (n * 7919) % 50000}
+            for n in range(settings.size)
+        ]
+        return 200, {"response": {"game_count": len(games), "games": games}}
+
+    if path.endswith("/GetRecentlyPlayedGames/v0001/"):
+        games = [
+            {"appid": 1000 + n, "name": f"Game {1000 + n}", "playtime_2weeks": 60 * n}
+            for n in range(5)
+        ]
+        return 200, {"response": {"total_count": 5, "games": games}}
+
+    return 404, {}
+
+
+def spotify_routes(method, path, query, body, settings):
+    count = min(settings.size, int(query.get("limit", [settings.size])[0]))
+
+    if path.endswith("/me/top/artists"):
+        items = [
+            {"name": f"Artist {n}", "genres": ["hyperpop", "bedroom pop", "shoegaze"]}
+            for n in range(count)
+        ]
+        return 200, {"items": items}
+
+    if path.endswith("/me/player/recently-played"):
+        items = [
+            {"track": {"name": f"Track {n}", "artists": [{"name": f"Artist {n}"}]}}
+            for n in range(count)
+        ]
+        return 200, {"items": items}
+
+    return 404, {"error": {"status": 404, "message": "Not found"}}
+
+
+def gemini_response(words):
+    text = " ".join(("roast", "stub", "words")[n % 3] for n in range(words))
+    return {
+        "candidates": [
+            {
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }
+        ],
+        "usageMetadata": {"promptTokenCount": 400, "candidatesTokenCount": words},
+    }
+
+
+def gemini_routes(method, path, query, body, settings):
+    if path.endswith(":generateContent") or path.endswith(":streamGenerateContent"):
+        return 200, gemini_response(settings.size)
+    if path.endswith(":countTokens"):
+        return 200, {"totalTokens": 2}
+    return 404, {"error": {"code": 404, "message": "Not found"}}
+
+
+ROUTES = {
+    "valorant": (valorant_routes, "/valorant"),
+    "anime": (anilist_routes, ""),
+    "steam": (steam_routes, ""),
+    "spotify": (spotify_routes, "/v1/"),
+    "gemini": (gemini_routes, ""),
+}
+
+
+class StubServer:
+    "One Upstream On 127.0.0.1 With Injected Latency, Errors And Payload Size"
+
+    def __init__(self, name, settings=None):
+        self.name = name
+        self.settings = settings or StubSettings()
+        self.requests = 0
+        self.errors = 0
+
+        routes, self.suffix = ROUTES[name]
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.respond(None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                self.respond(json.loads(raw) if raw else None)
+
+            def respond(self, body):
+                stub.requests += 1
+                settings = stub.settings
+                delay = max(0, random.uniform(-1, 1) * settings.jitter + settings.latency)
+                time.sleep(delay / 1000)
+
+                if random.random() < settings.error_rate:
+                    stub.errors += 1
+                    status, payload = 503, {"error": "injected failure"}
+                else:
+                    parts = urlsplit(self.path)
+                    status, payload = routes(
+                        self.command, parts.path, parse_qs(parts.query), body, settings
+                    )
+
+                data = json.dumps(payload).encode()
+                sse = "alt=sse" in self.path and status == 200
+                if sse:
+                    data = b"data: " + data + b"\r\n\r\n"
+
+                self.send_response(status)
+                self.send_header(
+                    "Content-Type", "text/event-stream" if sse else "application/json"
+                )
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name=f"stub-{name}", daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}{self.suffix}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def start_stubs(settings=None):
+    "Starts Every Upstream Stub; `settings` Maps Stub Name -> StubSettings"
+    settings = settings or {}
+    return {name: StubServer(name, settings.get(name)).start() for name in ROUTES}
+
+
+def stub_env(stubs):
+    "Environment That Points The App's Services At The Running Stubs"
+    return {
+        "VALORANT_API_URL": stubs["valorant"].url,
+        "ANILIST_API_URL": stubs["anime"].url,
+        "STEAM_API_URL": stubs["steam"].url,
+        "SPOTIFY_API_URL": stubs["spotify"].url,
+        "GEMINI_API_ENDPOINT": stubs["gemini"].url,
+        "HENRIK_API_KEY": "bench",
+        "STEAM_API_KEY": "bench",
+        "GEMINI_API_KEY": "bench",
+    }
@@ -0,0 +1,232 @@
+"""
+Micro-Benchmarks For The Provider Payload Transforms At Extreme Sizes
+
+    python -m bench.transforms
+    python -m bench.transforms --only steam --repeat 20
+    python -m bench.transforms --save transforms.json
+    python -m bench.transforms --compare transforms.json
+
+Time Is The Median Of --repeat Runs; Peak Memory Comes From One Extra Run
+Under tracemalloc, Counting Only What The Transform Itself Allocates.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from app.models import CombinedUserData
+from app.services.anime import LISTS, extract_from_page, parse_user, status_count
+from app.services.steam import (
+    format_recent_games,
+    format_top_games,
+    iter_json_array,
+    summarize_owned_games,
+)
+from app.services.valorant import parse_mmr, summarize_matches
+
+from .stubs import anilist_user, title, valorant_match
+
+
+def anilist_payload(entries):
+    data = {"u0": anilist_user("bench")}
+    for alias, _, _, _ in LISTS:
+        data[f"u0_{alias}"] = {
+            "mediaList": [{"media": {"title": title(n)}} for n in range(entries)]
+        }
+    return data
+
+
+def steam_library(games):
+    return json.dumps(
+        {
+            "response": {
+                "game_count": games,
+                "games": [
+                    {
+                        "appid": 1000 + n,
+                        "name": f"Game {1000 + n}",
+                        "playtime_forever": (n * 7919) % 50000,
+                        "img_icon_url": "0" * 40,
+                        "has_community_visible_stats": True,
+                        "playtime_windows_forever": (n * 7919) % 50000,
+                        "rtime_last_played": 1700000000 + n,
+                    }
+                    for n in range(games)
+                ],
+            }
+        }
+    )
+
+
+def chunked(text, size=65536):
+    return (text[i : i + size] for i in range(0, len(text), size))
+
+
+def steam_stream(document):
+    return summarize_owned_games(iter_json_array(chunked(document), "games"), 10)
+
+
+def steam_loads(document):
+    # What The Service Did Before Streaming: Parse Everything, Sort Everything
+    games = json.loads(document)["response"]["games"]
+    ranked = sorted(games, key=lambda g: g.get("playtime_forever", 0), reverse=True)
+    return sum(g.get("playtime_forever", 0) for g in games), ranked[:10]
+
+
+def heavy_profile(args):
+    "Every List In CombinedUserData At Extreme Length"
+    many = lambda fmt, n: [fmt.format(i) for i in range(n)]
+    return CombinedUserData(
+        spotify={
+            "top_artists": many("Artist {} (indie pop, art rock)", 50),
+            "recent_tracks": many("Track {0} by Artist {0}", 50),
+        },
+        valorant={"ign": "bench#0001", "rank": "Gold 2", "elo": 1234, "k_d_ratio": 1.1},
+        anime={
+            "username": "bench",
+            **{
+                key: many("A Very Long Light Novel Title Volume {}", args.anilist_entries)
+                for key in (
+                    "anime_watching_list",
+                    "anime_completed_list",
+                    "manga_reading_list",
+                    "manga_completed_list",
+                    "favorite_anime",
+                    "favorite_manga",
+                )
+            },
+        },
+        steam={
+            "player_name": "bench",
+            "total_playtime_hours": 12345.6,
+            "top_games": many("Game {} (100.0h)", args.steam_games),
+            "recent_games": many("Game {} (1.0h last 2w)", args.steam_games),
+        },
+    )
+
+
+def cases(args):
+    "name -> (transform, argument builder); Builders Run Outside The Timing"
+    anilist = lambda: anilist_payload(args.anilist_entries)
+    steam = lambda: steam_library(args.steam_games)
+    matches = lambda: [valorant_match(i, "bench", "0001") for i in range(10)]
+
+    return {
+        "anime.parse_user[limit=10]": (lambda d: parse_user(d, "u0", 10), anilist),
+        "anime.parse_user[limit=all]": (
+            lambda d: parse_user(d, "u0", args.anilist_entries),
+            anilist,
+        ),
+        "anime.extract_from_page": (
+            lambda d: extract_from_page(d["u0_animeCompleted"], args.anilist_entries),
+            anilist,
+        ),
+        "anime.status_count": (
+            lambda d: status_count(d["u0"]["statistics"]["anime"], "COMPLETED"),
+            anilist,
+        ),
+        "steam.stream_summarize": (steam_stream, steam),
+        "steam.loads_and_sort": (steam_loads, steam),
+        "steam.format_games": (
+            lambda games: (format_top_games(games), format_recent_games(games)),
+            lambda: steam_stream(steam_library(args.steam_games))[1],
+        ),
+        "valorant.summarize_matches": (
+            lambda m: summarize_matches(m, "bench", "0001"),
+            matches,
+        ),
+        "user_data.prompt_block": (
+            lambda combined: combined.prompt_block(args.prompt_budget),
+            lambda: heavy_profile(args),
+        ),
+        "valorant.parse_mmr": (
+            parse_mmr,
+            lambda: {"data": {"current": {"tier": {"name": "Gold 2"}, "elo": 1234}}},
+        ),
+    }
+
+
+def measure(transform, argument, repeat):
+    # Enough Calls Per Sample That Sub-Microsecond Transforms Still Register
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            transform(argument)
+        if time.perf_counter() - started >= 0.02 or number >= 10**6:
+            break
+        number *= 10
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            transform(argument)
+        samples.append((time.perf_counter() - started) / number)
+
+    tracemalloc.start()
+    transform(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 4),
+        "min_ms": round(min(samples) * 1000, 4),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(report, baseline, tolerance):
+    regressions = []
+    for name, now in report.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for key in ("median_ms", "peak_kib"):
+            if now[key] > before[key] * tolerance:
+                regressions.append(f"{name}: {key} {before[key]} -> {now[key]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--only", help="Run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--steam-games", type=int, default=10_000)
+    parser.add_argument("--anilist-entries", type=int, default=5_000)
+    parser.add_argument("--prompt-budget", type=int, default=600)
+    parser.add_argument("--save", help="Write the report as JSON")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier --save")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    report = {}
+    print(f"{'transform':<32}{'median ms':>12}{'min ms':>12}{'peak KiB':>12}")
+
+    for name, (transform, build) in cases(args).items():
+        if args.only and args.only not in name:
+            continue
+
+        report[name] = measure(transform, build(), args.repeat)
+        row = report[name]
+        print(f"{name:<32}{row['median_ms']:>12}{row['min_ms']:>12}{row['peak_kib']:>12}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -152,16 +152,7 @@ document.addEventListener("DOMContentLoaded", () => {
 		);
 
 		try {
-			const res = await fetch(`${API_BASE}/api/roast`, {
-				method: "POST",
-				headers: { "Content-Type": "application/json" },
-				credentials: "include",
-				body: JSON.stringify(data),
-			});
-
-			const json = await res.json();
-
-			if (json.error) throw new Error(json.error);
+			const json = await streamRoast(data);
 
 			currentRoastId = json.id;
 
@@ -173,15 +164,10 @@ document.addEventListener("DOMContentLoaded", () => {
 				inputs: json.inputs || data,
 			});
 
-			// Force Clear
-			roastText.textContent = "";
-
-			if (json.roast) {
-				setTimeout(() => {
-					typeWriter(json.roast, roastText);
-				}, 50);
-			} else {
+			if (!json.roast) {
 				roastText.textContent = "ROAST GENERATED BUT TEXT MISSING.";
+			} else if (roastText.textContent !== json.roast) {
+				roastText.textContent = json.roast;
 			}
 
 			resultBox.classList.remove("hidden");
@@ -201,6 +187,61 @@ document.addEventListener("DOMContentLoaded", () => {
 		}
 	}
 
+	// Streams Provider Progress And Roast Tokens, Resolves With The Saved Roast
+	async function streamRoast(data) {
+		const res = await fetch(`${API_BASE}/api/roast/stream`, {
+			method: "POST",
+			headers: { "Content-Type": "application/json" },
+			credentials: "include",
+			body: JSON.stringify(data),
+		});
+
+		const contentType = res.headers.get("Content-Type") || "";
+		if (!contentType.includes("text/event-stream") || !res.body) {
+			const json = await res.json();
+			if (json.error) throw new Error(json.error);
+			return json;
+		}
+
+		const reader = res.body.getReader();
+		const decoder = new TextDecoder();
+		let buffer = "";
+		let started = false;
+		let result = null;
+
+		while (true) {
+			const { value, done } = await reader.read();
+			if (done) break;
+
+			buffer += decoder.decode(value, { stream: true });
+			const frames = buffer.split("\n\n");
+			buffer = frames.pop();
+
+			for (const frame of frames) {
+				const event = (frame.match(/^event: (.*)$/m) || [])[1];
+				const payload = (frame.match(/^data: (.*)$/m) || [])[1];
+				if (!event || !payload) continue;
+
+				const body = JSON.parse(payload);
+
+				if (event === "provider") {
+					roastText.textContent = `LINKED ${body.provider.toUpperCase()}...`;
+				} else if (event === "token") {
+					if (!started) {
+						roastText.textContent = "";
+						started = true;
+					}
+					roastText.textContent += body.text;
+				} else if (event === "done") {
+					result = body;
+				}
+			}
+		}
+
+		if (!result) throw new Error("STREAM ENDED EARLY");
+		return result;
+	}
+
 	function typeWriter(text, element, speed = 20) {
 		if (!element) return;
 		element.textContent = "";